@@ -4,7 +4,7 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QTextEdit, QPushButton,
     QLabel, QScrollArea, QFrame, QApplication
 )
-from PySide6.QtCore import Qt, QThread, Signal, QTimer
+from PySide6.QtCore import Qt, Signal, QTimer
 from PySide6.QtGui import QFont, QColor, QTextCursor, QTextOption
 from services.chatbot_service import StockChatbot, ChatbotWorker
 import logging
@@ -27,6 +27,7 @@ class ChatMessage(QFrame):
         content.setReadOnly(True)
         content.setPlainText(message)
         content.setWordWrapMode(QTextOption.WrapMode.WordWrap)  # Proper enum
+        self.content = content
         
         # Style based on sender
         if is_bot:
@@ -73,6 +74,16 @@ class ChatMessage(QFrame):
         layout.addWidget(label)
         layout.addWidget(content)
         layout.addStretch()
+    
+    def append_text(self, text: str):
+        """Append text to the message (used while a response streams in)"""
+        cursor = self.content.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText(text)
+    
+    def set_text(self, text: str):
+        """Replace the message text"""
+        self.content.setPlainText(text)
 
 
 class ChatbotTab(QWidget):
@@ -84,6 +95,7 @@ class ChatbotTab(QWidget):
         self.cache = cache
         self.chatbot = StockChatbot(db, cache)
         self.chat_history = []
+        self._streaming_message = None  # Bot message being filled by streamed tokens
         
         # Main layout
         layout = QVBoxLayout(self)
@@ -165,16 +177,13 @@ class ChatbotTab(QWidget):
         self.status_label.setStyleSheet("color: #AAAAAA; font-size: 9pt;")
         layout.addWidget(self.status_label)
         
-        # Setup worker thread
-        self.worker_thread = QThread()
+        # Setup worker (messages run on the shared thread pool)
         self.worker = ChatbotWorker(self.chatbot)
-        self.worker.moveToThread(self.worker_thread)
         self.worker.response_ready.connect(self.on_response_received)
+        self.worker.token_received.connect(self.on_token_received)
         self.worker.error_occurred.connect(self.on_error)
-        self.worker_thread.finished.connect(self.worker.deleteLater)  # Clean up worker
-        self.worker_thread.start()
         
-        # Initial greeting (add after worker thread is setup)
+        # Initial greeting (add after worker is setup)
         QTimer.singleShot(100, self._show_greeting)
     
     def _show_greeting(self):
@@ -204,14 +213,27 @@ class ChatbotTab(QWidget):
         self.send_btn.setEnabled(False)
         self.message_input.setEnabled(False)
         
-        # Process in background thread
+        # Process on the worker thread pool
         self.worker.process_message(message)
     
+    def on_token_received(self, token: str):
+        """Show streamed response text as it arrives"""
+        if self._streaming_message is None:
+            self._streaming_message = self.add_bot_message("")
+            self.status_label.setText("✍️ Responding...")
+        self._streaming_message.append_text(token)
+        self.scroll_to_bottom()
+    
     def on_response_received(self, response: dict):
         """Handle chatbot response"""
         bot_message = response.get("response", "Sorry, I couldn't generate a response.")
         
-        self.add_bot_message(bot_message)
+        if self._streaming_message is not None:
+            self._streaming_message.set_text(bot_message)
+            self._streaming_message = None
+            self.scroll_to_bottom()
+        else:
+            self.add_bot_message(bot_message)
         
         # Update status
         stocks_mentioned = response.get("stocks_mentioned", [])
@@ -226,6 +248,7 @@ class ChatbotTab(QWidget):
     
     def on_error(self, error_msg: str):
         """Handle error in chatbot"""
+        self._streaming_message = None
         self.add_bot_message(f"❌ Error: {error_msg}\n\nPlease try again or rephrase your question.")
         self.status_label.setText("❌ Error occurred")
         self.send_btn.setEnabled(True)
@@ -237,11 +260,12 @@ class ChatbotTab(QWidget):
         self.chat_layout.insertWidget(self.chat_layout.count() - 1, msg_widget)
         self.scroll_to_bottom()
     
-    def add_bot_message(self, message: str):
+    def add_bot_message(self, message: str) -> ChatMessage:
         """Add bot message to chat"""
         msg_widget = ChatMessage(message, is_bot=True)
         self.chat_layout.insertWidget(self.chat_layout.count() - 1, msg_widget)
         self.scroll_to_bottom()
+        return msg_widget
     
     def scroll_to_bottom(self):
         """Scroll chat to bottom"""
@@ -250,21 +274,11 @@ class ChatbotTab(QWidget):
         )
     
     def closeEvent(self, event):
-        """Cleanup thread on close"""
+        """Wait for in-flight responses on close"""
         try:
-            if hasattr(self, 'worker_thread') and self.worker_thread.isRunning():
-                self.worker_thread.quit()
-                self.worker_thread.wait(3000)  # Wait up to 3 seconds
+            if hasattr(self, 'worker'):
+                self.worker.pool.waitForDone(3000)  # Wait up to 3 seconds
         except Exception as e:
-            logger.error(f"Error cleaning up worker thread: {e}")
+            logger.error(f"Error waiting for chatbot worker: {e}")
         
         super().closeEvent(event)
-    
-    def __del__(self):
-        """Destructor - final cleanup"""
-        try:
-            if hasattr(self, 'worker_thread') and self.worker_thread.isRunning():
-                self.worker_thread.quit()
-                self.worker_thread.wait(1000)
-        except:
-            pass
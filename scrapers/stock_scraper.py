@@ -1,6 +1,8 @@
 """Stock data scraper - Yahoo Finance, SEC filings, analyst ratings"""
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 import yfinance as yf
 from datetime import datetime, timedelta
@@ -14,6 +16,9 @@ logger = logging.getLogger(__name__)
 class StockScraper:
     """Scrape stock data from multiple sources"""
     
+    SPARK_URL = 'https://query1.finance.yahoo.com/v7/finance/spark'
+    SPARK_BATCH_SIZE = 20  # Symbols Yahoo accepts per spark request
+    
     def __init__(self):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
@@ -24,6 +29,20 @@ class StockScraper:
             'seeking_alpha': 'https://seekingalpha.com',
             'nasdaq': 'https://www.nasdaq.com'
         }
+        self.session = self._create_session()
+    
+    def _create_session(self) -> requests.Session:
+        """Pooled keep-alive session with retries for idempotent requests"""
+        session = requests.Session()
+        session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
     
     def get_quote(self, symbol: str) -> Dict:
         """Get current stock quote using yfinance"""
@@ -51,6 +70,63 @@ class StockScraper:
             logger.error(f"Error fetching quote for {symbol}: {e}")
             return {}
     
+    def get_stock_data(self, symbol: str) -> Dict:
+        """Get current stock data for a single symbol"""
+        return self.get_quote(symbol)
+    
+    def get_stock_data_batch(self, symbols: List[str]) -> Dict[str, Dict]:
+        """
+        Get price data for up to 20 symbols in one request
+        
+        Uses Yahoo's spark endpoint, which returns chart metadata (price,
+        previous close, 52-week range) for every symbol in a single response.
+        These are price-only quotes: there is no market cap, P/E or dividend
+        yield, so they must not stand in for get_quote() results in a cache.
+        
+        Args:
+            symbols: Stock symbols; only the first 20 are requested
+            
+        Returns:
+            Dictionary of symbol -> quote data; symbols Yahoo did not return are omitted
+        """
+        symbols = symbols[:self.SPARK_BATCH_SIZE]
+        if not symbols:
+            return {}
+        try:
+            response = self.session.get(
+                self.SPARK_URL,
+                params={'symbols': ','.join(symbols), 'range': '1d', 'interval': '1d'},
+                timeout=10
+            )
+            response.raise_for_status()
+            results = response.json().get('spark', {}).get('result') or []
+        except Exception as e:
+            logger.error(f"Error fetching batch quotes for {', '.join(symbols)}: {e}")
+            return {}
+        
+        timestamp = datetime.now().isoformat()
+        quotes = {}
+        for item in results:
+            series = item.get('response') or []
+            if not series:
+                continue
+            meta = series[0].get('meta', {})
+            symbol = item.get('symbol') or meta.get('symbol')
+            price = meta.get('regularMarketPrice', 0)
+            previous_close = meta.get('chartPreviousClose') or meta.get('previousClose') or 0
+            change = price - previous_close if price and previous_close else 0
+            quotes[symbol] = {
+                'symbol': symbol,
+                'price': price,
+                'previous_close': previous_close,
+                'change': change,
+                'change_percent': change / previous_close * 100 if previous_close else 0,
+                '52w_high': meta.get('fiftyTwoWeekHigh', 0),
+                '52w_low': meta.get('fiftyTwoWeekLow', 0),
+                'timestamp': timestamp
+            }
+        return quotes
+    
     def get_financial_data(self, symbol: str) -> Dict:
         """Get financial statements from yfinance"""
         try:
@@ -93,7 +169,7 @@ class StockScraper:
         """Scrape analyst ratings from MarketWatch"""
         try:
             url = f"https://www.marketwatch.com/investing/stock/{symbol.lower()}/research"
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.session.get(url, timeout=10)
             soup = BeautifulSoup(response.content, 'lxml')
             
             ratings = []
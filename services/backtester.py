@@ -4,7 +4,7 @@ Backtest trading strategies against historical data with comprehensive performan
 """
 
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import itertools
 import yfinance as yf
 import numpy as np
@@ -12,7 +12,92 @@ import pandas as pd
 
 from utils.base_service import BaseService
 from utils.data_models import Trade, PositionType, BacktestResults
-from services.strategies import Strategy
+from utils.jit import njit, prange
+from services.strategies import Strategy, rolling_cache
+
+
+@njit(cache=True)
+def _simulate_into(closes: np.ndarray, signals: np.ndarray, shares: float,
+                   commission: float, initial_capital: float,
+                   equity: np.ndarray, entries: np.ndarray, exits: np.ndarray) -> int:
+    """
+    Simulate one long-only strategy, writing into preallocated buffers
+    
+    Fills equity[i] with the account value at bar i and records the bar index
+    of every entry/exit. A trade still open at the end has exit index -1.
+    
+    Returns:
+        Number of trades recorded
+    """
+    n = closes.shape[0]
+    cash = initial_capital
+    entry_price = 0.0
+    status = 0  # 0 = flat, 1 = long
+    n_entries = 0
+    n_exits = 0
+    
+    # Entry/exit flags are computed arithmetically; index slots are written every
+    # bar and only committed when the flag is set. Price-dependent updates stay
+    # behind the flags, since 0 * NaN would carry one missing close into every
+    # later bar.
+    equity[0] = initial_capital
+    for i in range(1, n):
+        close_price = closes[i]
+        signal = signals[i]
+        entry_cost = close_price * shares * (1.0 + commission)
+        
+        # Close existing position on sell signal
+        do_close = status * int(signal == -1)
+        
+        # Open new position on buy signal if cash allows
+        do_open = (1 - status) * int(signal == 1) * int(cash >= entry_cost)
+        
+        if do_close:
+            cash += close_price * shares - entry_price * shares * commission
+        if do_open:
+            cash -= entry_cost
+            entry_price = close_price
+        
+        exits[n_exits] = i
+        n_exits += do_close
+        entries[n_entries] = i
+        n_entries += do_open
+        
+        status = status - do_close + do_open
+        
+        # Calculate current equity
+        equity[i] = cash + close_price * shares if status else cash
+    
+    # Position still open at the end
+    exits[n_exits] = -1
+    
+    return n_entries
+
+
+@njit(parallel=True, cache=True)
+def _simulate_batch(closes: np.ndarray, signal_matrix: np.ndarray, shares: float,
+                    commission: float, initial_capital: float):
+    """
+    Simulate M strategies over the same price series in parallel
+    
+    Args:
+        closes: Close prices, shape (N,)
+        signal_matrix: Buy/sell signals (1, -1, 0), shape (M, N)
+    
+    Returns:
+        (equity, entries, exits, trade_counts) with one row per strategy
+    """
+    m, n = signal_matrix.shape
+    equity = np.empty((m, n), dtype=np.float64)
+    entries = np.empty((m, n), dtype=np.int64)
+    exits = np.empty((m, n), dtype=np.int64)
+    trade_counts = np.zeros(m, dtype=np.int64)
+    
+    for k in prange(m):
+        trade_counts[k] = _simulate_into(closes, signal_matrix[k], shares, commission,
+                                         initial_capital, equity[k], entries[k], exits[k])
+    
+    return equity, entries, exits, trade_counts
 
 
 class Backtester(BaseService):
@@ -42,37 +127,14 @@ class Backtester(BaseService):
             start_date: Backtest start date
             end_date: Backtest end date
             shares_per_trade: Shares to trade per signal
-            
+        
         Returns:
             BacktestResults with performance metrics
         """
         try:
-            # Fetch historical data
-            data = yf.download(symbol, start=start_date, end=end_date, progress=False)
-            
-            if data.empty:
-                raise ValueError(f"No data available for {symbol}")
-            
-            if 'Close' not in data.columns:
-                raise ValueError("Data must contain 'Close' column")
-            
-            # Generate signals
-            signals = strategy.generate_signals(data)
-            
-            # Simulate trading
-            trades, equity_curve = self._simulate_trading(data, signals, shares_per_trade)
-            
-            # Create results
-            results = BacktestResults(
-                strategy_name=strategy.name,
-                symbol=symbol,
-                start_date=start_date,
-                end_date=end_date,
-                initial_capital=self.initial_capital,
-                trades=trades,
-                equity_curve=equity_curve,
-                dates=data.index.tolist()
-            )
+            data = self._fetch_data(symbol, start_date, end_date)
+            results = self._run_backtest(symbol, strategy, data, start_date, end_date,
+                                         shares_per_trade)
             
             self.logger.info(f"Backtest complete for {symbol} using {strategy.name}")
             return results
@@ -81,75 +143,119 @@ class Backtester(BaseService):
             self.logger.error(f"Backtest failed for {symbol}: {e}")
             raise
     
-    def _simulate_trading(self, data: pd.DataFrame, signals: pd.Series,
+    def _fetch_data(self, symbol: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+        """
+        Download historical OHLCV data for a backtest
+        
+        Raises:
+            ValueError: If no usable close prices are available
+        """
+        data = yf.download(symbol, start=start_date, end=end_date, progress=False)
+        
+        if data.empty:
+            raise ValueError(f"No data available for {symbol}")
+        
+        if 'Close' not in data.columns:
+            raise ValueError("Data must contain 'Close' column")
+        
+        return data
+    
+    def _run_backtest(self, symbol: str, strategy: Strategy, data: pd.DataFrame,
+                      start_date: datetime, end_date: datetime,
+                      shares_per_trade: float = 100.0,
+                      closes: Optional[np.ndarray] = None) -> BacktestResults:
+        """Run a strategy over already-fetched data (closes may be passed in to share it)"""
+        if closes is None:
+            closes = data['Close'].to_numpy(dtype=np.float64)
+        
+        # Generate signals
+        signals = strategy.signals_for(data, closes)
+        
+        # Simulate trading
+        trades, equity_curve = self._simulate_trading(data, closes, signals, shares_per_trade)
+        
+        return BacktestResults(
+            strategy_name=strategy.name,
+            symbol=symbol,
+            start_date=start_date,
+            end_date=end_date,
+            initial_capital=self.initial_capital,
+            trades=trades,
+            equity_curve=equity_curve,
+            dates=data.index.tolist()
+        )
+    
+    def _simulate_trading(self, data: pd.DataFrame, closes: np.ndarray, signals: np.ndarray,
                          shares_per_trade: float) -> Tuple[List[Trade], List[float]]:
         """
         Simulate trading based on signals
         
         Args:
             data: OHLCV data
-            signals: Buy/sell signals (1, -1, 0)
+            closes: Close prices as array
+            signals: Buy/sell signals (1, -1, 0) as int8 array
             shares_per_trade: Shares per trade
-            
+        
         Returns:
             (trades, equity_curve)
         """
+        n = len(closes)
+        equity = np.empty(n, dtype=np.float64)
+        entries = np.empty(n, dtype=np.int64)
+        exits = np.empty(n, dtype=np.int64)
+        
+        n_trades = _simulate_into(closes, signals, shares_per_trade,
+                                  self.commission, self.initial_capital, equity, entries, exits)
+        
+        trades = self._build_trades(data, closes, entries[:n_trades], exits[:n_trades],
+                                    shares_per_trade)
+        return trades, equity.tolist()
+    
+    def _build_trades(self, data: pd.DataFrame, closes: np.ndarray, entries: np.ndarray,
+                      exits: np.ndarray, shares_per_trade: float) -> List[Trade]:
+        """
+        Materialize Trade records from simulated entry/exit bar indices
+        
+        Args:
+            data: OHLCV data
+            closes: Close prices as array
+            entries: Entry bar index per trade
+            exits: Exit bar index per trade (-1 if still open at the end)
+            shares_per_trade: Shares per trade
+        
+        Returns:
+            List of closed trades
+        """
         trades = []
-        equity_curve = [self.initial_capital]
-        cash = self.initial_capital
-        position = None
+        symbol = data.name if hasattr(data, 'name') else 'UNKNOWN'
         
-        for i in range(1, len(data)):
-            current_date = data.index[i]
-            close_price = data['Close'].iloc[i]
-            signal = signals.iloc[i]
+        for entry_idx, exit_idx in zip(entries.tolist(), exits.tolist()):
+            entry_price = closes[entry_idx]
+            position = Trade(
+                entry_date=data.index[entry_idx],
+                exit_date=None,
+                symbol=symbol,
+                position_type=PositionType.LONG,
+                entry_price=entry_price,
+                shares=shares_per_trade
+            )
             
-            # Close existing position on sell signal
-            if position is not None and signal == -1:
-                exit_price = close_price
+            if exit_idx >= 0:
+                exit_price = closes[exit_idx]
                 commission_cost = position.entry_cost * self.commission
-                profit_loss = (exit_price - position.entry_price) * position.shares - commission_cost
-                
-                position.exit_date = current_date
+                position.exit_date = data.index[exit_idx]
                 position.exit_price = exit_price
-                position.profit_loss = profit_loss
-                
-                trades.append(position)
-                cash += exit_price * position.shares - commission_cost
-                position = None
+                position.profit_loss = (exit_price - entry_price) * shares_per_trade - commission_cost
+            else:
+                # Close any remaining position at end
+                last_price = closes[-1]
+                position.exit_date = data.index[-1]
+                position.exit_price = last_price
+                position.profit_loss = (last_price - entry_price) * shares_per_trade
             
-            # Open new position on buy signal
-            elif position is None and signal == 1:
-                entry_price = close_price
-                commission_cost = entry_price * shares_per_trade * self.commission
-                
-                if cash >= (entry_price * shares_per_trade + commission_cost):
-                    position = Trade(
-                        entry_date=current_date,
-                        exit_date=None,
-                        symbol=data.name if hasattr(data, 'name') else 'UNKNOWN',
-                        position_type=PositionType.LONG,
-                        entry_price=entry_price,
-                        shares=shares_per_trade
-                    )
-                    cash -= entry_price * shares_per_trade + commission_cost
-            
-            # Calculate current equity
-            current_equity = cash
-            if position is not None:
-                current_equity += close_price * position.shares
-            
-            equity_curve.append(current_equity)
-        
-        # Close any remaining position at end
-        if position is not None:
-            last_price = data['Close'].iloc[-1]
-            position.exit_date = data.index[-1]
-            position.exit_price = last_price
-            position.profit_loss = (last_price - position.entry_price) * position.shares
             trades.append(position)
         
-        return trades, equity_curve
+        return trades
     
     def optimize_strategy(self, symbol: str, strategy_class, 
                          param_grid: Dict[str, List],
@@ -165,7 +271,7 @@ class Backtester(BaseService):
             start_date: Backtest start date
             end_date: Backtest end date
             metric: Metric to optimize (sharpe_ratio, total_return_pct, win_rate_pct)
-            
+        
         Returns:
             (best_params, best_results)
         """
@@ -176,24 +282,34 @@ class Backtester(BaseService):
         param_names = list(param_grid.keys())
         param_values = list(param_grid.values())
         
-        for combination in itertools.product(*param_values):
-            params = dict(zip(param_names, combination))
-            
-            try:
-                strategy = strategy_class(**params)
-                results = self.backtest(symbol, strategy, start_date, end_date)
+        try:
+            data = self._fetch_data(symbol, start_date, end_date)
+        except Exception as e:
+            self.logger.error(f"Optimization failed for {symbol}: {e}")
+            return best_params, best_results
+        
+        # Every combination runs on the same close array, so shared rolling windows are computed once
+        closes = data['Close'].to_numpy(dtype=np.float64)
+        with rolling_cache():
+            for combination in itertools.product(*param_values):
+                params = dict(zip(param_names, combination))
                 
-                current_metric = getattr(results, metric, 0)
-                is_better = (current_metric > best_metric) if metric != 'max_drawdown_pct' else (current_metric < best_metric)
+                try:
+                    strategy = strategy_class(**params)
+                    results = self._run_backtest(symbol, strategy, data, start_date, end_date,
+                                                 closes=closes)
+                    
+                    current_metric = getattr(results, metric, 0)
+                    is_better = (current_metric > best_metric) if metric != 'max_drawdown_pct' else (current_metric < best_metric)
+                    
+                    if is_better:
+                        best_metric = current_metric
+                        best_params = params
+                        best_results = results
                 
-                if is_better:
-                    best_metric = current_metric
-                    best_params = params
-                    best_results = results
-            
-            except Exception as e:
-                self.logger.debug(f"Error with params {params}: {e}")
-                continue
+                except Exception as e:
+                    self.logger.debug(f"Error with params {params}: {e}")
+                    continue
         
         return best_params, best_results
     
@@ -207,19 +323,57 @@ class Backtester(BaseService):
             strategies: List of Strategy instances
             start_date: Backtest start date
             end_date: Backtest end date
-            
+        
         Returns:
             Dict with results for each strategy
         """
-        comparison = {}
+        comparison = {strategy.name: None for strategy in strategies}
+        
+        try:
+            data = self._fetch_data(symbol, start_date, end_date)
+        except Exception as e:
+            self.logger.error(f"Error fetching data for {symbol}: {e}")
+            return comparison
+        
+        closes = data['Close'].to_numpy(dtype=np.float64)
         
+        # Generate every strategy's signals up front so all simulations share one price sweep
+        valid_strategies = []
+        signal_rows = []
         for strategy in strategies:
             try:
-                results = self.backtest(symbol, strategy, start_date, end_date)
-                comparison[strategy.name] = results
+                signal_rows.append(strategy.signals_for(data, closes))
+                valid_strategies.append(strategy)
+            except Exception as e:
+                self.logger.error(f"Error backtesting {strategy.name}: {e}")
+        
+        if not valid_strategies:
+            return comparison
+        
+        shares_per_trade = 100.0
+        equity, entries, exits, trade_counts = _simulate_batch(
+            closes, np.stack(signal_rows), shares_per_trade,
+            self.commission, self.initial_capital
+        )
+        
+        dates = data.index.tolist()
+        for k, strategy in enumerate(valid_strategies):
+            try:
+                n_trades = trade_counts[k]
+                trades = self._build_trades(data, closes, entries[k, :n_trades],
+                                            exits[k, :n_trades], shares_per_trade)
+                comparison[strategy.name] = BacktestResults(
+                    strategy_name=strategy.name,
+                    symbol=symbol,
+                    start_date=start_date,
+                    end_date=end_date,
+                    initial_capital=self.initial_capital,
+                    trades=trades,
+                    equity_curve=equity[k].tolist(),
+                    dates=dates
+                )
             except Exception as e:
                 self.logger.error(f"Error backtesting {strategy.name}: {e}")
-                comparison[strategy.name] = None
         
         return comparison
     
@@ -232,7 +386,7 @@ class Backtester(BaseService):
             symbol: Stock ticker
             start_date: Start date
             end_date: End date
-            
+        
         Returns:
             BacktestResults for buy-and-hold strategy
         """
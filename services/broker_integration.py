@@ -5,10 +5,37 @@ Unified interface for connecting to multiple brokers: Alpaca, TD Ameritrade, Int
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from enum import Enum
 from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from types import MappingProxyType, SimpleNamespace
+import asyncio
 import json
+import logging
+import threading
+import time
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.data_models import DATACLASS_SLOTS
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
 
 
 class OrderType(Enum):
@@ -41,7 +68,28 @@ class PositionSide(Enum):
     SHORT = "short"
 
 
-@dataclass
+_OPEN_ORDER_STATUSES = frozenset({
+    OrderStatus.PENDING, OrderStatus.ACCEPTED, OrderStatus.PARTIAL_FILLED
+})
+
+# API value -> enum member, used when converting broker responses
+_ORDER_TYPES = {member.value: member for member in OrderType}
+_ORDER_SIDES = {member.value: member for member in OrderSide}
+_ORDER_STATUSES = {member.value: member for member in OrderStatus}
+
+# Alpaca reports some order states under its own names
+_ORDER_STATUSES.update({
+    'new': OrderStatus.ACCEPTED,
+    'pending_new': OrderStatus.PENDING,
+    'accepted_for_bidding': OrderStatus.ACCEPTED,
+    'partially_filled': OrderStatus.PARTIAL_FILLED,
+    'canceled': OrderStatus.CANCELLED,
+    'expired': OrderStatus.CANCELLED,
+    'done_for_day': OrderStatus.CANCELLED,
+})
+
+
+@dataclass(**DATACLASS_SLOTS)
 class Account:
     """Broker account information"""
     account_id: str
@@ -55,12 +103,15 @@ class Account:
     equity: float
     multiplier: float
     
+    # Calculated fields
+    portfolio_return_pct: float = field(init=False, default=0.0)
+    
     def __post_init__(self):
         """Calculate account metrics"""
         self.portfolio_return_pct = ((self.total_value - self.equity) / self.equity * 100) if self.equity > 0 else 0.0
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Position:
     """Open position"""
     symbol: str
@@ -84,9 +135,48 @@ class Position:
         
         if self.unrealized_gain_loss_pct == 0:
             self.unrealized_gain_loss_pct = (self.unrealized_gain_loss / (self.entry_price * self.quantity) * 100) if self.entry_price > 0 else 0.0
+    
+    @classmethod
+    def from_columns(cls, symbols: List[str], sides: List[PositionSide],
+                     quantities, entry_prices, current_prices, market_values,
+                     unrealized_gain_loss, unrealized_gain_loss_pct,
+                     average_fill_prices, asset_ids: List[str]) -> List['Position']:
+        """
+        Build many positions at once from column data
+        
+        Missing (zero) gain/loss values are derived for all rows in one NumPy
+        pass, and instances are populated directly instead of running
+        __post_init__ per row.
+        """
+        n = len(symbols)
+        quantity = np.asarray(quantities, dtype=np.float64)
+        entry = np.asarray(entry_prices, dtype=np.float64)
+        current = np.asarray(current_prices, dtype=np.float64)
+        upl = np.asarray(unrealized_gain_loss, dtype=np.float64)
+        uplpc = np.asarray(unrealized_gain_loss_pct, dtype=np.float64)
+        is_long = np.fromiter((side == PositionSide.LONG for side in sides), dtype=bool, count=n)
+        
+        upl = np.where(upl == 0, np.where(is_long, current - entry, entry - current) * quantity, upl)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            derived_pct = np.where(entry > 0, upl / (entry * quantity) * 100, 0.0)
+        uplpc = np.where(uplpc == 0, derived_pct, uplpc)
+        
+        positions = []
+        for row in zip(symbols, sides, quantity.tolist(), entry.tolist(), current.tolist(),
+                       np.asarray(market_values, dtype=np.float64).tolist(),
+                       upl.tolist(), uplpc.tolist(),
+                       np.asarray(average_fill_prices, dtype=np.float64).tolist(), asset_ids):
+            position = cls.__new__(cls)
+            (position.symbol, position.side, position.quantity, position.entry_price,
+             position.current_price, position.market_value, position.unrealized_gain_loss,
+             position.unrealized_gain_loss_pct, position.average_fill_price,
+             position.asset_id) = row
+            positions.append(position)
+        
+        return positions
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Order:
     """Order record"""
     order_id: str
@@ -98,22 +188,27 @@ class Order:
     stop_price: Optional[float] = None
     limit_price: Optional[float] = None
     status: OrderStatus = OrderStatus.PENDING
-    created_at: datetime = field(default_factory=datetime.now)
+    created_at: Optional[datetime] = None
     filled_at: Optional[datetime] = None
     filled_quantity: float = 0.0
     average_fill_price: float = 0.0
     commission: float = 0.0
     
+    def __post_init__(self):
+        """Default the creation time only when the caller did not supply one"""
+        if self.created_at is None:
+            self.created_at = datetime.now()
+    
     def is_filled(self) -> bool:
         """Check if order is fully filled"""
-        return self.status == OrderStatus.FILLED
+        return self.status is OrderStatus.FILLED
     
     def is_open(self) -> bool:
         """Check if order is still open"""
-        return self.status in [OrderStatus.PENDING, OrderStatus.ACCEPTED, OrderStatus.PARTIAL_FILLED]
+        return self.status in _OPEN_ORDER_STATUSES
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Trade:
     """Completed trade"""
     trade_id: str
@@ -122,7 +217,7 @@ class Trade:
     quantity: float
     entry_price: float
     exit_price: Optional[float] = None
-    entry_date: datetime = field(default_factory=datetime.now)
+    entry_date: Optional[datetime] = None
     exit_date: Optional[datetime] = None
     profit_loss: float = 0.0
     profit_loss_pct: float = 0.0
@@ -130,6 +225,9 @@ class Trade:
     
     def __post_init__(self):
         """Calculate trade metrics"""
+        if self.entry_date is None:
+            self.entry_date = datetime.now()
+        
         if self.exit_price is not None:
             if self.side == OrderSide.BUY:
                 self.profit_loss = (self.exit_price - self.entry_price) * self.quantity - self.commission
@@ -137,6 +235,276 @@ class Trade:
                 self.profit_loss = (self.entry_price - self.exit_price) * self.quantity - self.commission
             
             self.profit_loss_pct = (self.profit_loss / (self.entry_price * self.quantity) * 100) if self.entry_price > 0 else 0.0
+    
+    @classmethod
+    def from_columns(cls, trade_ids: List[str], symbols: List[str], sides: List[OrderSide],
+                     quantities, entry_prices, exit_prices: List[Optional[float]],
+                     entry_dates: List[datetime], exit_dates: List[Optional[datetime]],
+                     commissions) -> List['Trade']:
+        """
+        Build many trades at once from column data
+        
+        Profit/loss for closed trades is computed for all rows in one NumPy pass,
+        and instances are populated directly instead of running __post_init__.
+        """
+        n = len(trade_ids)
+        quantity = np.asarray(quantities, dtype=np.float64)
+        entry = np.asarray(entry_prices, dtype=np.float64)
+        exit_ = np.array([np.nan if price is None else price for price in exit_prices], dtype=np.float64)
+        commission = np.asarray(commissions, dtype=np.float64)
+        is_buy = np.fromiter((side == OrderSide.BUY for side in sides), dtype=bool, count=n)
+        closed = ~np.isnan(exit_)
+        
+        pnl = np.where(is_buy, exit_ - entry, entry - exit_) * quantity - commission
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pnl_pct = np.where(entry > 0, pnl / (entry * quantity) * 100, 0.0)
+        pnl = np.where(closed, pnl, 0.0)
+        pnl_pct = np.where(closed, pnl_pct, 0.0)
+        
+        trades = []
+        for row in zip(trade_ids, symbols, sides, quantity.tolist(), entry.tolist(), exit_prices,
+                       entry_dates, exit_dates, pnl.tolist(), pnl_pct.tolist(), commission.tolist()):
+            trade = cls.__new__(cls)
+            (trade.trade_id, trade.symbol, trade.side, trade.quantity, trade.entry_price,
+             trade.exit_price, trade.entry_date, trade.exit_date, trade.profit_loss,
+             trade.profit_loss_pct, trade.commission) = row
+            trades.append(trade)
+        
+        return trades
+
+
+@dataclass
+class OrderSpec:
+    """Order request used for basket submission"""
+    symbol: str
+    quantity: float
+    side: OrderSide
+    order_type: OrderType = OrderType.MARKET
+    price: Optional[float] = None
+    stop_price: Optional[float] = None
+    limit_price: Optional[float] = None
+
+
+def _positions_from_records(records: List[Tuple]) -> List[Position]:
+    """
+    Build positions from raw API records
+    
+    Each record is (symbol, qty, avg_price, current_price, market_value,
+    unrealized_pl, unrealized_plpc, asset_id); numeric values may be strings.
+    A negative quantity denotes a short position.
+    """
+    if not records:
+        return []
+    
+    symbols, qtys, avg_prices, current_prices, market_values, upl, uplpc, asset_ids = zip(*records)
+    signed_qty = np.array(qtys, dtype=np.float64)
+    sides = [PositionSide.LONG if is_long else PositionSide.SHORT
+             for is_long in (signed_qty > 0).tolist()]
+    
+    return Position.from_columns(
+        symbols, sides, np.abs(signed_qty), avg_prices, current_prices, market_values,
+        upl, np.array(uplpc, dtype=np.float64) * 100, avg_prices, asset_ids
+    )
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket allowing `rate` requests per `per` seconds
+    
+    The bucket can be corrected from server-reported quota (see update()) so
+    that bursts from other processes sharing the same account are accounted for.
+    """
+    
+    def __init__(self, rate: int, per: float):
+        self.rate = rate
+        self.per = per
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._reset_at = 0.0  # wall-clock time the server quota resets
+        self._lock = threading.Lock()
+    
+    def _refill(self, now: float) -> None:
+        """Add tokens accrued since the last update (lock must be held)"""
+        self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate / self.per)
+        self._updated = now
+    
+    def reserve(self) -> float:
+        """Take one token, returning how many seconds to wait before using it"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            delay = 0.0 if self._tokens >= 0 else -self._tokens * self.per / self.rate
+            if self._tokens < 0 and self._reset_at:
+                delay = max(delay, self._reset_at - time.time())
+            return delay
+    
+    def update(self, limit: Optional[int], remaining: Optional[int],
+               reset_at: Optional[float]) -> None:
+        """
+        Sync the bucket with rate-limit headers from a response
+        
+        Args:
+            limit: Requests allowed per window (X-RateLimit-Limit)
+            remaining: Requests left in the window (X-RateLimit-Remaining)
+            reset_at: Unix time the window resets (X-RateLimit-Reset)
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if limit:
+                self.rate = limit
+            if remaining is not None:
+                self._tokens = min(self._tokens, float(remaining))
+            if reset_at is not None:
+                self._reset_at = reset_at
+    
+    def status(self) -> Dict[str, float]:
+        """Current limit, remaining requests and reset time"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                'limit': self.rate,
+                'remaining': max(0, int(self._tokens)),
+                'reset': self._reset_at
+            }
+    
+    def acquire(self) -> None:
+        """Block until a request may be sent"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+    
+    async def acquire_async(self) -> None:
+        """Wait without blocking the event loop until a request may be sent"""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+# Rate limiters are per API key since Alpaca enforces quota per account
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def _get_rate_limiter(api_key: str, rate: int = 200, per: float = 60.0) -> RateLimiter:
+    """Get the rate limiter shared by all clients using api_key"""
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(api_key)
+        if limiter is None:
+            limiter = _rate_limiters[api_key] = RateLimiter(rate, per)
+        return limiter
+
+
+def _header_number(headers, name: str) -> Optional[float]:
+    """Read a numeric response header, or None if missing or malformed"""
+    try:
+        return float(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _update_rate_limit(api_key: Optional[str], headers) -> None:
+    """Feed X-RateLimit-* response headers into the limiter for api_key"""
+    if not api_key or 'X-RateLimit-Remaining' not in headers:
+        return
+    
+    limit = _header_number(headers, 'X-RateLimit-Limit')
+    remaining = _header_number(headers, 'X-RateLimit-Remaining')
+    _get_rate_limiter(api_key).update(
+        int(limit) if limit else None,
+        int(remaining) if remaining is not None else None,
+        _header_number(headers, 'X-RateLimit-Reset')
+    )
+
+
+class RateLimitAdapter(HTTPAdapter):
+    """HTTPAdapter that records Alpaca rate-limit headers from every response"""
+    
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        _update_rate_limit(request.headers.get('APCA-API-KEY-ID'), response.headers)
+        return response
+
+
+if MSGSPEC_AVAILABLE:
+    class _Bar(msgspec.Struct):
+        """Single OHLCV bar from the Alpaca market data API"""
+        t: str
+        o: float
+        h: float
+        l: float
+        c: float
+        v: float
+    
+    class _BarsPage(msgspec.Struct):
+        """One page of the Alpaca bars response"""
+        bars: Optional[List[_Bar]] = None
+        next_page_token: Optional[str] = None
+    
+    _bars_decoder = msgspec.json.Decoder(_BarsPage)
+
+
+# Record layout for streamed historical bars
+BAR_DTYPE = np.dtype([
+    ('t', 'datetime64[ns]'),
+    ('o', np.float64),
+    ('h', np.float64),
+    ('l', np.float64),
+    ('c', np.float64),
+    ('v', np.float64)
+])
+
+
+def _decode_bars_page(content: bytes) -> Tuple[list, Optional[str]]:
+    """
+    Decode one page of Alpaca bars
+    
+    Returns:
+        (bars, next_page_token) where each bar exposes t, o, h, l, c, v attributes
+    """
+    if MSGSPEC_AVAILABLE:
+        page = _bars_decoder.decode(content)
+        return page.bars or [], page.next_page_token
+    
+    page = _json_loads(content)
+    return [SimpleNamespace(**bar) for bar in page.get('bars') or []], page.get('next_page_token')
+
+
+def _format_timestamp(value: datetime) -> str:
+    """Format a datetime as RFC 3339, treating naive values as UTC"""
+    return value.isoformat() + ('Z' if value.tzinfo is None else '')
+
+
+class _StreamAuthError(ConnectionError):
+    """The trade_updates stream rejected the API credentials"""
+
+
+def _rejected_status(error: Exception) -> Optional[int]:
+    """HTTP status of a rejected WebSocket handshake, if error is one"""
+    status = getattr(error, 'status_code', None)  # websockets < 14
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status
+
+
+# Shared HTTP session so every broker client reuses pooled TCP/TLS connections
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+
+def _get_http_session() -> requests.Session:
+    """Get the pooled requests session shared by all synchronous broker clients"""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            adapter = RateLimitAdapter(
+                pool_connections=40,
+                pool_maxsize=100,
+                max_retries=Retry(total=3, backoff_factor=0.2,
+                                  status_forcelist=[429, 500, 502, 503, 504])
+            )
+            _http_session = requests.Session()
+            _http_session.mount('https://', adapter)
+    return _http_session
 
 
 class BrokerAPI(ABC):
@@ -154,7 +522,56 @@ class BrokerAPI(ABC):
         self.api_key = api_key
         self.secret_key = secret_key
         self.sandbox = sandbox
+        self.broker_name = self.__class__.__name__
         self.is_connected = False
+        self._response_cache: Dict[Tuple, Tuple[Any, float]] = {}
+        self._inflight: Dict[Tuple, Future] = {}  # key -> load in progress
+        self._cache_lock = threading.RLock()
+    
+    def _cached(self, key: Tuple, ttl: float, loader: Callable[[], Any]) -> Any:
+        """
+        Return a recent response for key, calling loader() if missing or expired
+        
+        Concurrent pollers asking for the same key wait on a single in-flight
+        load instead of each hitting the API. The lock only guards the cache
+        bookkeeping and is never held while loader() runs.
+        """
+        with self._cache_lock:
+            entry = self._response_cache.get(key)
+            if entry is not None and time.monotonic() - entry[1] < ttl:
+                return entry[0]
+            
+            future = self._inflight.get(key)
+            loading = future is None
+            if loading:
+                future = Future()
+                self._inflight[key] = future
+        
+        if not loading:
+            return future.result()
+        
+        try:
+            result = loader()
+        except BaseException as e:
+            with self._cache_lock:
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+            future.set_exception(e)
+            raise
+        
+        with self._cache_lock:
+            # A load that raced with _invalidate_cache() is returned but not stored
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+                self._response_cache[key] = (result, time.monotonic())
+        future.set_result(result)
+        return result
+    
+    def _invalidate_cache(self) -> None:
+        """Drop cached responses after a state-changing operation"""
+        with self._cache_lock:
+            self._response_cache.clear()
+            self._inflight.clear()
     
     @abstractmethod
     def connect(self) -> bool:
@@ -190,6 +607,24 @@ class BrokerAPI(ABC):
         """Place an order"""
         pass
     
+    def place_orders(self, specs: List[OrderSpec]) -> List[Optional[Order]]:
+        """
+        Place a basket of orders
+        
+        Returns:
+            One entry per spec, in order; None where the order failed
+        """
+        orders = []
+        for spec in specs:
+            try:
+                orders.append(self.place_order(spec.symbol, spec.quantity, spec.side,
+                                               spec.order_type, spec.price,
+                                               spec.stop_price, spec.limit_price))
+            except Exception as e:
+                logger.error("Error placing order for %s: %s", spec.symbol, e)
+                orders.append(None)
+        return orders
+    
     @abstractmethod
     def cancel_order(self, order_id: str) -> bool:
         """Cancel an order"""
@@ -198,18 +633,58 @@ class BrokerAPI(ABC):
     @abstractmethod
     def get_historical_data(self, symbol: str, start_date: datetime,
                            end_date: datetime, timeframe: str = "1day") -> Dict:
-        """Get historical price data"""
+        """
+        Get historical price data
+        
+        Returns:
+            Dict with 'dates', 'opens', 'highs', 'lows', 'closes' and 'volumes'
+            as equal-length NumPy arrays (empty dict on failure)
+        """
         pass
 
 
 class AlpacaBroker(BrokerAPI):
     """Alpaca broker integration"""
     
+    # Seconds a polled response is reused before hitting the API again
+    ACCOUNT_CACHE_TTL = 2.0
+    POSITIONS_CACHE_TTL = 0.5
+    ORDERS_CACHE_TTL = 0.5
+    
+    # Alpaca allows 200 requests per minute per account
+    RATE_LIMIT = 200
+    RATE_LIMIT_PERIOD = 60.0
+    
+    # Concurrent submissions used by place_orders
+    ORDER_WORKERS = 16
+    
+    # Seconds to wait before reconnecting a dropped trade_updates stream
+    STREAM_RECONNECT_DELAY = 5.0
+    
+    # Market data API timeframe for each supported timeframe name
+    TIMEFRAMES = {
+        "1min": "1Min",
+        "5min": "5Min",
+        "15min": "15Min",
+        "1hour": "1Hour",
+        "1day": "1Day"
+    }
+    
     def __init__(self, api_key: str, secret_key: str, sandbox: bool = True):
         super().__init__(api_key, secret_key, sandbox)
         self.broker_name = "Alpaca"
         self.base_url = "https://paper-api.alpaca.markets" if sandbox else "https://api.alpaca.markets"
         self.data_base_url = "https://data.alpaca.markets"
+        self._rate_limiter = _get_rate_limiter(api_key, self.RATE_LIMIT, self.RATE_LIMIT_PERIOD)
+        self._auth_headers = {
+            'APCA-API-KEY-ID': api_key,
+            'APCA-API-SECRET-KEY': secret_key
+        }
+        
+        # Mirrors kept current by the trade_updates stream (None when not streaming)
+        self._stream_future = None
+        self._positions_mirror: Optional[Dict[str, Position]] = None
+        self._orders_mirror: Optional[Dict[str, Order]] = None
     
     def connect(self) -> bool:
         """Connect to Alpaca API"""
@@ -222,96 +697,298 @@ class AlpacaBroker(BrokerAPI):
                 base_url=self.base_url,
                 api_version='v2'
             )
+            self.client._session = _get_http_session()
             
             # Test connection
             account = self.client.get_account()
             self.is_connected = True
             return True
         except Exception as e:
-            print(f"Failed to connect to Alpaca: {e}")
+            logger.error("Failed to connect to Alpaca: %s", e)
             return False
     
     def disconnect(self) -> bool:
         """Disconnect from Alpaca"""
+        self.stop_stream()
         self.is_connected = False
         return True
     
+    def start_stream(self) -> bool:
+        """
+        Mirror positions and orders from Alpaca's trade_updates WebSocket
+        
+        While the stream runs, get_orders() is served from in-memory state
+        updated by pushed events, with no REST calls. get_positions() takes
+        quantities from the mirror but still prices them from the (briefly
+        cached) REST positions, since trade_updates carries no quotes. The
+        mirror is resynced over REST each time the socket (re)connects, and
+        the stream stops for good if Alpaca rejects the credentials.
+        
+        Returns:
+            True if the stream is running
+        """
+        with self._cache_lock:
+            if self._stream_future is not None:
+                return True
+            
+            self._positions_mirror = None
+            self._orders_mirror = None
+            try:
+                self._stream_future = asyncio.run_coroutine_threadsafe(
+                    self._run_stream(), _get_async_loop()
+                )
+                return True
+            except Exception as e:
+                logger.error("Failed to start Alpaca stream: %s", e)
+                return False
+    
+    def stop_stream(self) -> None:
+        """Stop the trade_updates stream and fall back to REST polling"""
+        with self._cache_lock:
+            if self._stream_future is not None:
+                self._stream_future.cancel()
+                self._stream_future = None
+            self._positions_mirror = None
+            self._orders_mirror = None
+    
+    async def _run_stream(self) -> None:
+        """
+        Keep a trade_updates subscription open, reconnecting on failure
+        
+        Runs on the shared event loop, so it never takes threading locks: the
+        mirrors are only ever replaced with new dicts, never mutated in place,
+        and readers on other threads just pick up the current reference.
+        """
+        import websockets
+        
+        url = self.base_url.replace('https://', 'wss://') + "/stream"
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            try:
+                async with websockets.connect(url) as ws:
+                    await ws.send(json.dumps({
+                        'action': 'auth', 'key': self.api_key, 'secret': self.secret_key
+                    }))
+                    await ws.send(json.dumps({
+                        'action': 'listen', 'data': {'streams': ['trade_updates']}
+                    }))
+                    
+                    # Events may have been missed while disconnected
+                    positions, orders = await loop.run_in_executor(None, self._load_mirror)
+                    self._positions_mirror = positions
+                    self._orders_mirror = orders
+                    
+                    async for message in ws:
+                        self._apply_stream_message(_json_loads(message))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if isinstance(e, _StreamAuthError) or _rejected_status(e) in (401, 403):
+                    logger.error("Alpaca stream authorization failed, not reconnecting: %s", e)
+                    self._stream_future = None
+                    self._positions_mirror = None
+                    self._orders_mirror = None
+                    return
+                logger.warning("Alpaca stream disconnected: %s", e)
+                await asyncio.sleep(self.STREAM_RECONNECT_DELAY)
+    
+    def _load_mirror(self) -> Tuple[Dict[str, Position], Dict[str, Order]]:
+        """Load fresh position and order mirrors over REST"""
+        positions = {position.symbol: position for position in self._fetch_positions()}
+        orders = {order.order_id: order for order in self._fetch_orders()}
+        return positions, orders
+    
+    def _apply_stream_message(self, message: Dict) -> None:
+        """Apply one trade_updates event to the mirrors (runs on the event loop)"""
+        stream = message.get('stream')
+        data = message.get('data') or {}
+        
+        if stream == 'authorization' and data.get('status') != 'authorized':
+            raise _StreamAuthError(f"Alpaca stream authorization failed: {data}")
+        if stream != 'trade_updates':
+            return
+        
+        try:
+            order = _order_from_json(data['order'])
+        except (KeyError, TypeError, ValueError) as e:
+            logger.debug("Skipping unrecognized trade update: %s", e)
+            return
+        
+        orders = self._orders_mirror
+        positions = self._positions_mirror
+        if orders is None or positions is None:
+            return
+        
+        self._orders_mirror = {**orders, order.order_id: order}
+        
+        if data.get('event') in ('fill', 'partial_fill') and 'position_qty' in data:
+            self._positions_mirror = self._apply_fill(
+                positions, order.symbol, float(data['position_qty']),
+                float(data['qty']), float(data['price'])
+            )
+    
+    @staticmethod
+    def _apply_fill(positions: Dict[str, Position], symbol: str, position_qty: float,
+                    fill_qty: float, fill_price: float) -> Dict[str, Position]:
+        """
+        Return a copy of the position mirror updated for a fill on symbol
+        
+        The fill price stands in as the current price until get_positions()
+        reprices the position from REST.
+        """
+        positions = dict(positions)
+        if position_qty == 0:
+            positions.pop(symbol, None)
+            return positions
+        
+        side = PositionSide.LONG if position_qty > 0 else PositionSide.SHORT
+        quantity = abs(position_qty)
+        previous = positions.get(symbol)
+        
+        if previous is None or previous.side != side:
+            entry_price = fill_price
+        elif quantity > previous.quantity:
+            # Position grew: blend the fill into the average entry price
+            entry_price = (previous.entry_price * previous.quantity + fill_price * fill_qty) / quantity
+        else:
+            entry_price = previous.entry_price
+        
+        positions[symbol] = Position(
+            symbol=symbol,
+            side=side,
+            quantity=quantity,
+            entry_price=entry_price,
+            current_price=fill_price,
+            market_value=quantity * fill_price,
+            unrealized_gain_loss=0.0,
+            unrealized_gain_loss_pct=0.0,
+            average_fill_price=entry_price,
+            asset_id=previous.asset_id if previous else ""
+        )
+        return positions
+    
     def get_account(self) -> Account:
         """Get Alpaca account information"""
         try:
-            acc = self.client.get_account()
-            
-            return Account(
-                account_id=acc.id,
-                broker="Alpaca",
-                account_type=acc.account_type,
-                cash=float(acc.cash),
-                buying_power=float(acc.buying_power),
-                portfolio_value=float(acc.portfolio_value),
-                total_value=float(acc.portfolio_value) + float(acc.cash),
-                day_trading_buying_power=float(acc.daytrade_buying_power),
-                equity=float(acc.equity),
-                multiplier=int(acc.multiplier) if hasattr(acc, 'multiplier') else 1
-            )
+            return self._cached(('account',), self.ACCOUNT_CACHE_TTL, self._fetch_account)
         except Exception as e:
-            print(f"Error getting account: {e}")
+            logger.error("Error getting account: %s", e)
             raise
     
     def get_positions(self) -> List[Position]:
         """Get Alpaca positions"""
+        mirror = self._positions_mirror if self._stream_future is not None else None
+        
         try:
-            positions = []
-            alpaca_positions = self.client.list_positions()
-            
-            for pos in alpaca_positions:
-                position = Position(
-                    symbol=pos.symbol,
-                    side=PositionSide.LONG if float(pos.qty) > 0 else PositionSide.SHORT,
-                    quantity=abs(float(pos.qty)),
-                    entry_price=float(pos.avg_fill_price),
-                    current_price=float(pos.current_price),
-                    market_value=float(pos.market_value),
-                    unrealized_gain_loss=float(pos.unrealized_pl),
-                    unrealized_gain_loss_pct=float(pos.unrealized_plpc) * 100,
-                    average_fill_price=float(pos.avg_fill_price),
-                    asset_id=pos.asset_id
-                )
-                positions.append(position)
-            
-            return positions
+            positions = self._cached(('positions',), self.POSITIONS_CACHE_TTL,
+                                     self._fetch_positions)
         except Exception as e:
-            print(f"Error getting positions: {e}")
-            return []
+            logger.error("Error getting positions: %s", e)
+            if mirror is None:
+                return []
+            positions = []
+        
+        if mirror is None:
+            return list(positions)
+        return self._price_mirror(mirror, positions)
+    
+    @staticmethod
+    def _price_mirror(mirror: Dict[str, Position], quoted: List[Position]) -> List[Position]:
+        """
+        Combine streamed quantities with current prices from REST positions
+        
+        A symbol REST does not know about yet (filled since the last poll)
+        keeps its last fill price.
+        """
+        by_symbol = {position.symbol: position for position in quoted}
+        positions = []
+        for position in mirror.values():
+            quote = by_symbol.get(position.symbol)
+            price = quote.current_price if quote is not None else position.current_price
+            positions.append(Position(
+                symbol=position.symbol,
+                side=position.side,
+                quantity=position.quantity,
+                entry_price=position.entry_price,
+                current_price=price,
+                market_value=position.quantity * price,
+                unrealized_gain_loss=0.0,
+                unrealized_gain_loss_pct=0.0,
+                average_fill_price=position.average_fill_price,
+                asset_id=position.asset_id or (quote.asset_id if quote is not None else "")
+            ))
+        return positions
     
     def get_orders(self, status: Optional[OrderStatus] = None) -> List[Order]:
         """Get Alpaca orders"""
+        mirror = self._orders_mirror if self._stream_future is not None else None
+        if mirror is not None:
+            return [order for order in mirror.values()
+                    if status is None or order.status == status]
+        
         try:
-            orders = []
-            status_filter = status.value if status else None
-            alpaca_orders = self.client.list_orders(status=status_filter)
-            
-            for order in alpaca_orders:
-                order_obj = Order(
-                    order_id=order.id,
-                    symbol=order.symbol,
-                    order_type=OrderType(order.order_type),
-                    side=OrderSide(order.side),
-                    quantity=float(order.qty),
-                    price=float(order.limit_price) if order.limit_price else None,
-                    stop_price=float(order.stop_price) if order.stop_price else None,
-                    status=OrderStatus(order.status),
-                    created_at=order.created_at,
-                    filled_at=order.filled_at,
-                    filled_quantity=float(order.filled_qty) if order.filled_qty else 0.0,
-                    average_fill_price=float(order.filled_avg_price) if order.filled_avg_price else 0.0
-                )
-                orders.append(order_obj)
-            
-            return orders
+            return list(self._cached(('orders', status), self.ORDERS_CACHE_TTL,
+                                     lambda: self._fetch_orders(status)))
         except Exception as e:
-            print(f"Error getting orders: {e}")
+            logger.error("Error getting orders: %s", e)
             return []
     
+    def _fetch_account(self) -> Account:
+        """Request account information from Alpaca"""
+        self._rate_limiter.acquire()
+        acc = self.client.get_account()
+        
+        return Account(
+            account_id=acc.id,
+            broker="Alpaca",
+            account_type=acc.account_type,
+            cash=float(acc.cash),
+            buying_power=float(acc.buying_power),
+            portfolio_value=float(acc.portfolio_value),
+            total_value=float(acc.portfolio_value) + float(acc.cash),
+            day_trading_buying_power=float(acc.daytrade_buying_power),
+            equity=float(acc.equity),
+            multiplier=int(acc.multiplier) if hasattr(acc, 'multiplier') else 1
+        )
+    
+    def _fetch_positions(self) -> List[Position]:
+        """Request open positions from Alpaca"""
+        self._rate_limiter.acquire()
+        alpaca_positions = self.client.list_positions()
+        
+        return _positions_from_records([
+            (pos.symbol, pos.qty, pos.avg_fill_price, pos.current_price, pos.market_value,
+             pos.unrealized_pl, pos.unrealized_plpc, pos.asset_id)
+            for pos in alpaca_positions
+        ])
+    
+    def _fetch_orders(self, status: Optional[OrderStatus] = None) -> List[Order]:
+        """Request orders from Alpaca"""
+        orders = []
+        status_filter = status.value if status else None
+        self._rate_limiter.acquire()
+        alpaca_orders = self.client.list_orders(status=status_filter)
+        
+        for order in alpaca_orders:
+            order_obj = Order(
+                order_id=order.id,
+                symbol=order.symbol,
+                order_type=_ORDER_TYPES[order.order_type],
+                side=_ORDER_SIDES[order.side],
+                quantity=float(order.qty),
+                price=float(order.limit_price) if order.limit_price else None,
+                stop_price=float(order.stop_price) if order.stop_price else None,
+                status=_ORDER_STATUSES[order.status],
+                created_at=order.created_at,
+                filled_at=order.filled_at,
+                filled_quantity=float(order.filled_qty) if order.filled_qty else 0.0,
+                average_fill_price=float(order.filled_avg_price) if order.filled_avg_price else 0.0
+            )
+            orders.append(order_obj)
+        
+        return orders
+    
     def place_order(self, symbol: str, quantity: float, side: OrderSide,
                    order_type: OrderType = OrderType.MARKET,
                    price: Optional[float] = None,
@@ -319,84 +996,360 @@ class AlpacaBroker(BrokerAPI):
                    limit_price: Optional[float] = None) -> Order:
         """Place Alpaca order"""
         try:
-            order_data = {
-                'symbol': symbol,
-                'qty': quantity,
-                'side': side.value,
-                'type': order_type.value,
-                'time_in_force': 'day'
-            }
-            
-            if order_type == OrderType.LIMIT and limit_price:
-                order_data['limit_price'] = limit_price
-            elif order_type == OrderType.STOP and stop_price:
-                order_data['stop_price'] = stop_price
-            elif order_type == OrderType.STOP_LIMIT and stop_price and limit_price:
-                order_data['stop_price'] = stop_price
-                order_data['limit_price'] = limit_price
+            order_data = self._order_request(symbol, quantity, side, order_type,
+                                             stop_price, limit_price)
             
+            self._rate_limiter.acquire()
             response = self.client.submit_order(**order_data)
+            self._invalidate_cache()
             
             return Order(
                 order_id=response.id,
                 symbol=response.symbol,
-                order_type=OrderType(response.order_type),
-                side=OrderSide(response.side),
+                order_type=_ORDER_TYPES[response.order_type],
+                side=_ORDER_SIDES[response.side],
                 quantity=float(response.qty),
                 price=limit_price or stop_price,
-                status=OrderStatus(response.status),
+                status=_ORDER_STATUSES[response.status],
                 created_at=response.created_at
             )
         except Exception as e:
-            print(f"Error placing order: {e}")
+            logger.error("Error placing order: %s", e)
             raise
     
+    def rate_limit_status(self) -> Dict[str, float]:
+        """
+        Get the client-side view of the Alpaca rate limit
+        
+        Returns:
+            Dict with 'limit', 'remaining' and 'reset' (Unix time)
+        """
+        return self._rate_limiter.status()
+    
+    @staticmethod
+    def _order_request(symbol: str, quantity: float, side: OrderSide, order_type: OrderType,
+                       stop_price: Optional[float], limit_price: Optional[float]) -> Dict:
+        """Build the Alpaca order submission payload"""
+        order_data = {
+            'symbol': symbol,
+            'qty': quantity,
+            'side': side.value,
+            'type': order_type.value,
+            'time_in_force': 'day'
+        }
+        
+        if order_type == OrderType.LIMIT and limit_price:
+            order_data['limit_price'] = limit_price
+        elif order_type == OrderType.STOP and stop_price:
+            order_data['stop_price'] = stop_price
+        elif order_type == OrderType.STOP_LIMIT and stop_price and limit_price:
+            order_data['stop_price'] = stop_price
+            order_data['limit_price'] = limit_price
+        
+        return order_data
+    
+    def place_orders(self, specs: List[OrderSpec]) -> List[Optional[Order]]:
+        """
+        Place a basket of Alpaca orders concurrently
+        
+        Submissions are spread over a thread pool; place_order throttles each
+        one to stay within Alpaca's request rate limit.
+        
+        Returns:
+            One entry per spec, in order; None where the order failed
+        """
+        if not specs:
+            return []
+        
+        def submit(spec: OrderSpec) -> Optional[Order]:
+            try:
+                return self.place_order(spec.symbol, spec.quantity, spec.side, spec.order_type,
+                                        spec.price, spec.stop_price, spec.limit_price)
+            except Exception:
+                return None
+        
+        with ThreadPoolExecutor(max_workers=min(self.ORDER_WORKERS, len(specs))) as executor:
+            return list(executor.map(submit, specs))
+    
     def cancel_order(self, order_id: str) -> bool:
         """Cancel Alpaca order"""
         try:
+            self._rate_limiter.acquire()
             self.client.cancel_order(order_id)
+            self._invalidate_cache()
             return True
         except Exception as e:
-            print(f"Error cancelling order: {e}")
+            logger.error("Error cancelling order: %s", e)
             return False
     
-    def get_historical_data(self, symbol: str, start_date: datetime,
-                           end_date: datetime, timeframe: str = "1day") -> Dict:
-        """Get Alpaca historical data"""
-        try:
-            from alpaca_trade_api.rest import TimeFrame
+    def iter_historical_bars(self, symbol: str, start_date: datetime, end_date: datetime,
+                             timeframe: str = "1day") -> Iterator[np.ndarray]:
+        """
+        Stream Alpaca historical bars one API page at a time
+        
+        Each page is decoded with msgspec (or orjson) and yielded as a structured
+        array with fields t, o, h, l, c, v, so callers can process bars
+        incrementally or stop early without holding the full history.
+        
+        Yields:
+            Structured NumPy array of dtype BAR_DTYPE per page
+        """
+        params = {
+            'timeframe': self.TIMEFRAMES.get(timeframe, "1Day"),
+            'start': _format_timestamp(start_date),
+            'end': _format_timestamp(end_date),
+            'adjustment': 'raw',
+            'limit': 10000
+        }
+        url = f"{self.data_base_url}/v2/stocks/{symbol}/bars"
+        
+        while True:
+            self._rate_limiter.acquire()
+            response = _get_http_session().get(url, params=params, headers=self._auth_headers,
+                                               timeout=30)
+            response.raise_for_status()
             
-            timeframe_map = {
-                "1min": TimeFrame.Minute,
-                "5min": TimeFrame(5, "minute"),
-                "15min": TimeFrame(15, "minute"),
-                "1hour": TimeFrame.Hour,
-                "1day": TimeFrame.Day
-            }
+            bars, next_page_token = _decode_bars_page(response.content)
             
-            tf = timeframe_map.get(timeframe, TimeFrame.Day)
+            # Fill the page in a single pass over the decoded bars
+            page = np.empty(len(bars), dtype=BAR_DTYPE)
+            for i, bar in enumerate(bars):
+                page[i] = (bar.t.rstrip('Z'), bar.o, bar.h, bar.l, bar.c, bar.v)
+            yield page
             
-            bars = self.client.get_crypto_bars(
-                symbol,
-                tf,
-                start=start_date,
-                end=end_date,
-                adjustment='raw'
-            )
+            if not next_page_token:
+                break
+            params['page_token'] = next_page_token
+    
+    def get_historical_data(self, symbol: str, start_date: datetime,
+                           end_date: datetime, timeframe: str = "1day") -> Dict:
+        """
+        Get Alpaca historical data
+        
+        Returns:
+            Dict of NumPy arrays: dates, opens, highs, lows, closes, volumes
+        """
+        try:
+            pages = list(self.iter_historical_bars(symbol, start_date, end_date, timeframe))
+            bars = np.concatenate(pages) if pages else np.empty(0, dtype=BAR_DTYPE)
             
             return {
-                'dates': [bar.t for bar in bars],
-                'opens': [bar.o for bar in bars],
-                'highs': [bar.h for bar in bars],
-                'lows': [bar.l for bar in bars],
-                'closes': [bar.c for bar in bars],
-                'volumes': [bar.v for bar in bars]
+                'dates': np.ascontiguousarray(bars['t']),
+                'opens': np.ascontiguousarray(bars['o']),
+                'highs': np.ascontiguousarray(bars['h']),
+                'lows': np.ascontiguousarray(bars['l']),
+                'closes': np.ascontiguousarray(bars['c']),
+                'volumes': np.ascontiguousarray(bars['v'])
             }
         except Exception as e:
-            print(f"Error getting historical data: {e}")
+            logger.error("Error getting historical data: %s", e)
             return {}
 
 
+# Shared event loop and HTTP client for all AsyncAlpacaBroker instances
+_async_loop: Optional[asyncio.AbstractEventLoop] = None
+_async_client = None
+_async_lock = threading.Lock()
+
+
+def _get_async_loop() -> asyncio.AbstractEventLoop:
+    """Get the background event loop used for async broker I/O, starting it on first use"""
+    global _async_loop
+    with _async_lock:
+        if _async_loop is None:
+            _async_loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=_async_loop.run_forever,
+                                      name="broker-async-io", daemon=True)
+            thread.start()
+    return _async_loop
+
+
+def _get_async_client():
+    """Get the shared httpx.AsyncClient (must be called on the background loop)"""
+    global _async_client
+    if _async_client is None:
+        import httpx
+        
+        try:
+            import h2  # noqa: F401 - enables HTTP/2 support in httpx
+            http2 = True
+        except ImportError:
+            http2 = False
+        
+        _async_client = httpx.AsyncClient(
+            http2=http2,
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=40,
+                                keepalive_expiry=30)
+        )
+    return _async_client
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an RFC 3339 timestamp from the Alpaca API"""
+    if not value:
+        return None
+    # Trim nanoseconds to microseconds and normalize the UTC suffix
+    value = value.replace('Z', '+00:00')
+    if '.' in value:
+        head, tail = value.split('.', 1)
+        offset_at = max(tail.find('+'), tail.find('-'))
+        fraction, offset = (tail[:offset_at], tail[offset_at:]) if offset_at >= 0 else (tail, '')
+        value = f"{head}.{fraction[:6].ljust(6, '0')}{offset}"
+    return datetime.fromisoformat(value)
+
+
+def _order_from_json(order: Dict) -> Order:
+    """Convert an Alpaca order JSON object to an Order"""
+    return Order(
+        order_id=order['id'],
+        symbol=order['symbol'],
+        order_type=_ORDER_TYPES[order['order_type']],
+        side=_ORDER_SIDES[order['side']],
+        quantity=float(order['qty']),
+        price=float(order['limit_price']) if order.get('limit_price') else None,
+        stop_price=float(order['stop_price']) if order.get('stop_price') else None,
+        status=_ORDER_STATUSES[order['status']],
+        created_at=_parse_timestamp(order['created_at']),
+        filled_at=_parse_timestamp(order.get('filled_at')),
+        filled_quantity=float(order['filled_qty']) if order.get('filled_qty') else 0.0,
+        average_fill_price=float(order['filled_avg_price']) if order.get('filled_avg_price') else 0.0
+    )
+
+
+class AsyncAlpacaBroker(AlpacaBroker):
+    """
+    Alpaca broker using an async HTTP transport
+    
+    Account, position and order reads go straight to the Alpaca REST API over a
+    pooled httpx.AsyncClient, so independent requests run concurrently. The
+    synchronous BrokerAPI methods are kept as a facade over the async ones.
+    """
+    
+    def connect(self) -> bool:
+        """Connect to Alpaca API and start the async transport"""
+        if not super().connect():
+            return False
+        
+        try:
+            self._loop = _get_async_loop()
+            return True
+        except Exception as e:
+            logger.error("Failed to start async transport for Alpaca: %s", e)
+            self.is_connected = False
+            return False
+    
+    def _run(self, coro):
+        """Run a coroutine on the background loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+    
+    async def _request_json(self, path: str, params: Optional[Dict] = None) -> Any:
+        """GET a JSON document from the Alpaca trading API"""
+        await self._rate_limiter.acquire_async()
+        client = _get_async_client()
+        response = await client.get(f"{self.base_url}{path}", params=params,
+                                    headers=self._auth_headers)
+        _update_rate_limit(self.api_key, response.headers)
+        response.raise_for_status()
+        return _json_loads(response.content)
+    
+    async def get_account_async(self) -> Account:
+        """Get Alpaca account information"""
+        acc = await self._request_json("/v2/account")
+        
+        return Account(
+            account_id=acc['id'],
+            broker="Alpaca",
+            account_type=acc.get('account_type', 'individual'),
+            cash=float(acc['cash']),
+            buying_power=float(acc['buying_power']),
+            portfolio_value=float(acc['portfolio_value']),
+            total_value=float(acc['portfolio_value']) + float(acc['cash']),
+            day_trading_buying_power=float(acc['daytrading_buying_power']),
+            equity=float(acc['equity']),
+            multiplier=int(acc.get('multiplier', 1))
+        )
+    
+    async def get_positions_async(self) -> List[Position]:
+        """Get Alpaca positions"""
+        return _positions_from_records([
+            (pos['symbol'], pos['qty'], pos['avg_entry_price'], pos['current_price'],
+             pos['market_value'], pos['unrealized_pl'], pos['unrealized_plpc'], pos['asset_id'])
+            for pos in await self._request_json("/v2/positions")
+        ])
+    
+    async def get_orders_async(self, status: Optional[OrderStatus] = None) -> List[Order]:
+        """Get Alpaca orders"""
+        params = {'status': status.value} if status else None
+        return [_order_from_json(order) for order in await self._request_json("/v2/orders", params)]
+    
+    async def _submit_one(self, spec: OrderSpec) -> Optional[Order]:
+        """Submit a single order, returning None if it is rejected"""
+        await self._rate_limiter.acquire_async()
+        try:
+            client = _get_async_client()
+            payload = self._order_request(spec.symbol, spec.quantity, spec.side, spec.order_type,
+                                          spec.stop_price, spec.limit_price)
+            response = await client.post(f"{self.base_url}/v2/orders", content=json.dumps(payload),
+                                         headers={**self._auth_headers, 'Content-Type': 'application/json'})
+            _update_rate_limit(self.api_key, response.headers)
+            response.raise_for_status()
+            order = _order_from_json(_json_loads(response.content))
+            order.price = spec.limit_price or spec.stop_price
+            return order
+        except Exception as e:
+            logger.error("Error placing order for %s: %s", spec.symbol, e)
+            return None
+    
+    async def place_orders_async(self, specs: List[OrderSpec]) -> List[Optional[Order]]:
+        """
+        Submit a basket of orders concurrently
+        
+        Runs on the event loop, so it leaves the response cache alone (that
+        takes a threading lock); callers should _invalidate_cache() afterwards.
+        """
+        orders = await asyncio.gather(*(self._submit_one(spec) for spec in specs))
+        return list(orders)
+    
+    def place_orders(self, specs: List[OrderSpec]) -> List[Optional[Order]]:
+        """
+        Place a basket of Alpaca orders concurrently
+        
+        Returns:
+            One entry per spec, in order; None where the order failed
+        """
+        if not specs:
+            return []
+        orders = self._run(self.place_orders_async(specs))
+        self._invalidate_cache()
+        return orders
+    
+    async def snapshot(self) -> Tuple[Account, List[Position], List[Order]]:
+        """Fetch account, positions and orders concurrently"""
+        return await asyncio.gather(
+            self.get_account_async(),
+            self.get_positions_async(),
+            self.get_orders_async()
+        )
+    
+    def get_snapshot(self) -> Tuple[Account, List[Position], List[Order]]:
+        """Fetch account, positions and orders concurrently (blocking)"""
+        account, positions, orders = self._run(self.snapshot())
+        return account, positions, orders
+    
+    def _fetch_account(self) -> Account:
+        """Request account information over the async transport"""
+        return self._run(self.get_account_async())
+    
+    def _fetch_positions(self) -> List[Position]:
+        """Request open positions over the async transport"""
+        return self._run(self.get_positions_async())
+    
+    def _fetch_orders(self, status: Optional[OrderStatus] = None) -> List[Order]:
+        """Request orders over the async transport"""
+        return self._run(self.get_orders_async(status))
+
+
 class TDAmeritradeBroker(BrokerAPI):
     """TD Ameritrade broker integration"""
     
@@ -414,12 +1367,14 @@ class TDAmeritradeBroker(BrokerAPI):
                 account_id=self.api_key,
                 token=self.secret_key
             )
+            if hasattr(self.client, 'session'):
+                self.client.session = _get_http_session()
             
             self.is_connected = True
             return True
         except Exception as e:
-            print(f"Failed to connect to TD Ameritrade: {e}")
-            print("Note: TD Ameritrade integration requires thinkorswim library")
+            logger.error("Failed to connect to TD Ameritrade: %s", e)
+            logger.warning("TD Ameritrade integration requires thinkorswim library")
             return False
     
     def disconnect(self) -> bool:
@@ -444,7 +1399,7 @@ class TDAmeritradeBroker(BrokerAPI):
                 multiplier=1
             )
         except Exception as e:
-            print(f"Error getting account: {e}")
+            logger.error("Error getting account: %s", e)
             raise
     
     def get_positions(self) -> List[Position]:
@@ -481,9 +1436,46 @@ class TDAmeritradeBroker(BrokerAPI):
 class BrokerManager:
     """Manager for multiple broker connections"""
     
+    # Calls routed straight to the active broker (see _bind_active_broker)
+    _ROUTED_METHODS = ('get_account', 'get_positions', 'get_orders',
+                       'place_order', 'place_orders', 'cancel_order')
+    
     def __init__(self):
         self.brokers: Dict[str, BrokerAPI] = {}
-        self.active_broker: Optional[str] = None
+        self._active_broker: Optional[str] = None
+        self._broker_names: Dict[str, str] = {}  # connection name -> broker display name
+        
+        # Read-only views shared by list_brokers/get_broker_info until brokers change
+        self._names_view: Optional[Tuple[str, ...]] = None
+        self._info_view: Optional[MappingProxyType] = None
+        self._info_connected: Tuple[bool, ...] = ()  # is_connected flags the info view was built from
+    
+    @property
+    def active_broker(self) -> Optional[str]:
+        """Name of the active broker connection"""
+        return self._active_broker
+    
+    @active_broker.setter
+    def active_broker(self, name: Optional[str]) -> None:
+        self._active_broker = name
+        self._info_view = None
+        self._bind_active_broker()
+    
+    def _bind_active_broker(self) -> None:
+        """
+        Bind the active broker's methods onto this manager
+        
+        The bound methods are stored on the instance, shadowing the fallback
+        methods defined on the class, so routed calls go straight to the broker
+        without looking it up each time. With no active broker the class
+        fallbacks apply and return None or empty results.
+        """
+        broker = self.get_active_broker()
+        for method in self._ROUTED_METHODS:
+            if broker is not None:
+                setattr(self, method, getattr(broker, method))
+            else:
+                self.__dict__.pop(method, None)
     
     def add_broker(self, name: str, broker: BrokerAPI) -> bool:
         """
@@ -492,19 +1484,23 @@ class BrokerManager:
         Args:
             name: Unique name for this broker connection
             broker: BrokerAPI instance
-            
+        
         Returns:
             True if successfully connected
         """
         try:
             if broker.connect():
                 self.brokers[name] = broker
-                if self.active_broker is None:
+                self._broker_names[name] = broker.broker_name
+                self._names_view = None
+                self._info_view = None
+                # Also rebinds when an active connection is replaced under the same name
+                if self.active_broker is None or self.active_broker == name:
                     self.active_broker = name
                 return True
             return False
         except Exception as e:
-            print(f"Error adding broker {name}: {e}")
+            logger.error("Error adding broker %s: %s", name, e)
             return False
     
     def remove_broker(self, name: str) -> bool:
@@ -513,6 +1509,9 @@ class BrokerManager:
             if name in self.brokers:
                 self.brokers[name].disconnect()
                 del self.brokers[name]
+                del self._broker_names[name]
+                self._names_view = None
+                self._info_view = None
                 
                 if self.active_broker == name:
                     self.active_broker = list(self.brokers.keys())[0] if self.brokers else None
@@ -520,7 +1519,7 @@ class BrokerManager:
                 return True
             return False
         except Exception as e:
-            print(f"Error removing broker {name}: {e}")
+            logger.error("Error removing broker %s: %s", name, e)
             return False
     
     def set_active_broker(self, name: str) -> bool:
@@ -568,6 +1567,13 @@ class BrokerManager:
             return broker.place_order(symbol, quantity, side, order_type, price, stop_price, limit_price)
         return None
     
+    def place_orders(self, specs: List[OrderSpec]) -> List[Optional[Order]]:
+        """Place a basket of orders on active broker"""
+        broker = self.get_active_broker()
+        if broker:
+            return broker.place_orders(specs)
+        return [None] * len(specs)
+    
     def cancel_order(self, order_id: str) -> bool:
         """Cancel order on active broker"""
         broker = self.get_active_broker()
@@ -575,17 +1581,74 @@ class BrokerManager:
             return broker.cancel_order(order_id)
         return False
     
-    def list_brokers(self) -> List[str]:
+    # Seconds to wait for all brokers in the fan-out helpers
+    FAN_OUT_TIMEOUT = 10.0
+    
+    def _fan_out(self, call: Callable[[BrokerAPI], Any], default: Any) -> Dict[str, Any]:
+        """
+        Run call(broker) on every connected broker concurrently
+        
+        A broker that fails or has not answered within FAN_OUT_TIMEOUT gets
+        `default` so it does not affect the results from the others. Slow calls
+        are left to finish in the background instead of being waited on.
+        """
+        if not self.brokers:
+            return {}
+        
+        results = {}
+        executor = ThreadPoolExecutor(max_workers=len(self.brokers),
+                                      thread_name_prefix="broker-fan-out")
+        try:
+            futures = {name: executor.submit(call, broker) for name, broker in self.brokers.items()}
+            done, _ = wait(futures.values(), timeout=self.FAN_OUT_TIMEOUT)
+            for name, future in futures.items():
+                if future not in done:
+                    logger.error("Broker %s did not respond within %.1fs", name, self.FAN_OUT_TIMEOUT)
+                    results[name] = default
+                    continue
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    logger.error("Error querying broker %s: %s", name, e)
+                    results[name] = default
+        finally:
+            executor.shutdown(wait=False)
+        return results
+    
+    def get_all_accounts(self) -> Dict[str, Optional[Account]]:
+        """Get accounts from every connected broker"""
+        return self._fan_out(lambda broker: broker.get_account(), None)
+    
+    def get_all_positions(self) -> Dict[str, List[Position]]:
+        """Get positions from every connected broker"""
+        return self._fan_out(lambda broker: broker.get_positions(), [])
+    
+    def get_all_orders(self, status: Optional[OrderStatus] = None) -> Dict[str, List[Order]]:
+        """Get orders from every connected broker"""
+        return self._fan_out(lambda broker: broker.get_orders(status), [])
+    
+    def list_brokers(self) -> Tuple[str, ...]:
         """List all connected brokers"""
-        return list(self.brokers.keys())
-    
-    def get_broker_info(self) -> Dict:
-        """Get info about all connected brokers"""
-        info = {}
-        for name, broker in self.brokers.items():
-            info[name] = {
-                'broker': broker.broker_name if hasattr(broker, 'broker_name') else 'Unknown',
-                'connected': broker.is_connected,
-                'active': name == self.active_broker
-            }
-        return info
+        if self._names_view is None:
+            self._names_view = tuple(self.brokers)
+        return self._names_view
+    
+    def get_broker_info(self) -> MappingProxyType:
+        """
+        Get info about all connected brokers
+        
+        Returns a read-only mapping that is reused until a broker is added,
+        removed or made active, or a broker connects or disconnects.
+        """
+        connected = tuple(broker.is_connected for broker in self.brokers.values())
+        if self._info_view is None or connected != self._info_connected:
+            self._info_connected = connected
+            self._info_view = MappingProxyType({
+                name: MappingProxyType({
+                    'broker': self._broker_names[name],
+                    'connected': broker.is_connected,
+                    'active': name == self.active_broker
+                })
+                for name, broker in self.brokers.items()
+            })
+        return self._info_view
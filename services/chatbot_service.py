@@ -1,194 +1,131 @@
 """AI-powered chatbot for stock recommendations and analysis"""
 
 import os
+import re
 import json
 import logging
-from typing import Dict, List, Optional
-from datetime import datetime
-import yfinance as yf
-from scrapers.stock_scraper import StockScraper
-from analyzers.fundamental_analyzer import FundamentalAnalyzer
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from services.semantic_cache import SemanticCache
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
-
-class StockChatbot:
-    """AI chatbot for stock recommendations and analysis"""
-    
-    def __init__(self, db=None, cache=None):
-        """Initialize chatbot with database and cache"""
-        self.db = db
-        self.cache = cache
-        self.scraper = StockScraper()
-        self.analyzer = FundamentalAnalyzer()
-        
-        # Try to initialize OpenAI API
-        self.api_key = os.getenv('OPENAI_API_KEY')
-        self.use_openai = False
-        if self.api_key:
-            try:
-                from openai import OpenAI
-                self.client = OpenAI(api_key=self.api_key)
-                self.use_openai = True
-                logger.info("OpenAI API initialized successfully")
-            except Exception as e:
-                logger.warning(f"OpenAI API not available: {e}. Using rule-based responses.")
-                self.use_openai = False
-    
-    def get_response(self, user_message: str) -> Dict:
-        """
-        Get chatbot response to user message
-        
-        Args:
-            user_message: User's question or request
-            
-        Returns:
-            Dictionary with response and metadata
-        """
-        user_message = user_message.strip().lower()
-        
-        # Try AI response first if OpenAI available
-        if self.use_openai:
-            try:
-                return self._get_ai_response(user_message)
-            except Exception as e:
-                logger.error(f"Error getting AI response: {e}")
-                # Fall back to rule-based
-        
-        # Rule-based responses
-        return self._get_rule_based_response(user_message)
-    
-    def _get_ai_response(self, user_message: str) -> Dict:
-        """Get response using OpenAI API"""
-        from openai import OpenAI
-        
-        client = OpenAI(api_key=self.api_key)
-        
-        # Build context about stocks
-        context = self._build_stock_context(user_message)
-        
-        system_prompt = """You are an expert financial advisor and stock analysis assistant. 
+# Static prompt prefix: kept byte-identical across requests so provider-side
+# prompt caching can reuse it; per-request data goes in the user message only
+_SYSTEM_PROMPT = """You are an expert financial advisor and stock analysis assistant. 
 You help investors make informed decisions about stocks, portfolio management, and investment strategies.
 Provide specific, actionable advice based on fundamental analysis and market trends.
 Always include risk disclaimers in your responses.
 When discussing specific stocks, provide analysis with reasoning."""
-        
-        user_prompt = f"""Stock Context:
+
+_SYSTEM_MESSAGE = {"role": "system", "content": _SYSTEM_PROMPT}
+
+# Rule-based intents in priority order: the first listed intent with a keyword
+# in the message wins
+_INTENT_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "recommend": ("recommend", "should i buy", "what stocks", "best stocks", "recommendations"),
+    "sell": ("when to sell", "sell signals", "stop loss", "take profit"),
+    "short": ("short", "short sell", "bearish", "downside"),
+    "analyze": ("analyze", "analysis", "fundamentals", "pe ratio", "earnings"),
+    "portfolio": ("portfolio", "diversif", "allocation", "balance"),
+    "market": ("market", "trend", "outlook", "fed", "interest rate", "inflation"),
+    "risk": ("risk", "volatility", "downside", "protection", "hedging"),
+}
+_INTENT_NAMES: Tuple[str, ...] = tuple(_INTENT_KEYWORDS)
+_INTENT_PRIORITY: Dict[str, int] = {intent: rank for rank, intent in enumerate(_INTENT_NAMES)}
+_ANALYZE_NEEDS_SYMBOL = "Please mention a stock symbol (like AAPL, GOOGL, MSFT) for detailed analysis."
+
+
+def _build_intent_automaton():
+    """
+    Compile every intent keyword into one Aho-Corasick automaton
+    
+    Each keyword's payload is the priority rank of the best intent it belongs
+    to; a keyword shared by two intents can only ever select the higher one.
+    """
+    automaton = ahocorasick.Automaton()
+    for rank, keywords in enumerate(_INTENT_KEYWORDS.values()):
+        for keyword in keywords:
+            if keyword not in automaton:
+                automaton.add_word(keyword, rank)
+    automaton.make_automaton()
+    return automaton
+
+
+def _build_intent_regex():
+    """
+    Compile every intent keyword into one alternation with a named group per intent
+    
+    The alternation sits in a lookahead so matches are zero-width and may
+    overlap ("short sell signals" must still see "sell signals"). Groups are
+    in priority order, so each position reports its highest-priority intent.
+    """
+    groups = []
+    for intent, keywords in _INTENT_KEYWORDS.items():
+        groups.append(f"(?P<{intent}>{'|'.join(map(re.escape, keywords))})")
+    return re.compile(f"(?=(?:{'|'.join(groups)}))")
+
+
+_INTENT_AUTOMATON = _build_intent_automaton() if AHOCORASICK_AVAILABLE else None
+_INTENT_RE = _build_intent_regex()
+
+
+def _match_intent(message: str) -> Optional[str]:
+    """Return the highest-priority intent whose keywords occur in the message"""
+    if _INTENT_AUTOMATON is not None:
+        rank = min((rank for _, rank in _INTENT_AUTOMATON.iter(message)), default=None)
+    else:
+        rank = min((_INTENT_PRIORITY[match.lastgroup] for match in _INTENT_RE.finditer(message)), default=None)
+    return None if rank is None else _INTENT_NAMES[rank]
+
+
+# Symbols recognised in chat messages
+_COMMON_SYMBOLS: FrozenSet[str] = frozenset({
+    'AAPL', 'GOOGL', 'MSFT', 'AMZN', 'NVDA', 'TSLA', 'META', 'NFLX',
+    'MRNA', 'JNJ', 'PFE', 'V', 'MA', 'JPM', 'BAC', 'GS', 'SPY', 'QQQ',
+    'IVV', 'VOO', 'VTI', 'BRK.B', 'BRKA', 'XOM', 'CVX', 'COP', 'MPC'
+})
+_SYMBOL_RE = re.compile(r"\b[A-Z]{1,5}(?:\.[A-Z])?\b")
+
+# Response timestamps: local time, ISO 8601, second resolution
+_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+def _timestamp() -> str:
+    """Current local time formatted for response dictionaries"""
+    return time.strftime(_TIMESTAMP_FORMAT)
+
+
+# A user message normalized once and shared by the cache, AI and rule-based paths
+_Msg = namedtuple("_Msg", "raw lower upper symbols")
+
+
+def _symbols_in(upper_text: str) -> List[str]:
+    """Known symbols in already-uppercased text, in order of first appearance"""
+    candidates = dict.fromkeys(_SYMBOL_RE.findall(upper_text))
+    return [symbol for symbol in candidates if symbol in _COMMON_SYMBOLS]
+
+
+_USER_PROMPT_TEMPLATE = """Stock Context:
 {context}
 
-User Question: {user_message}
+User Question: {question}
 
 Provide a helpful, detailed response focused on stock investments and analysis."""
-        
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.7,
-            max_tokens=1000
-        )
-        
-        ai_response = response.choices[0].message.content
-        
-        return {
-            "response": ai_response,
-            "timestamp": datetime.now().isoformat(),
-            "is_ai": True,
-            "stocks_mentioned": self._extract_stock_symbols(user_message)
-        }
-    
-    def _get_rule_based_response(self, user_message: str) -> Dict:
-        """Get response using rule-based logic"""
-        response = ""
-        stocks_mentioned = self._extract_stock_symbols(user_message)
-        
-        # Recommendation queries
-        if any(word in user_message for word in ["recommend", "should i buy", "what stocks", "best stocks", "recommendations"]):
-            response = self._get_recommendations()
-        
-        # Selling advice
-        elif any(word in user_message for word in ["when to sell", "sell signals", "stop loss", "take profit"]):
-            response = self._get_sell_advice()
-        
-        # Shorting advice
-        elif any(word in user_message for word in ["short", "short sell", "bearish", "downside"]):
-            response = self._get_short_advice()
-        
-        # Stock analysis
-        elif any(word in user_message for word in ["analyze", "analysis", "fundamentals", "pe ratio", "earnings"]):
-            if stocks_mentioned:
-                response = self._analyze_stocks(stocks_mentioned)
-            else:
-                response = "Please mention a stock symbol (like AAPL, GOOGL, MSFT) for detailed analysis."
-        
-        # Portfolio advice
-        elif any(word in user_message for word in ["portfolio", "diversif", "allocation", "balance"]):
-            response = self._get_portfolio_advice()
-        
-        # Market trends
-        elif any(word in user_message for word in ["market", "trend", "outlook", "fed", "interest rate", "inflation"]):
-            response = self._get_market_analysis()
-        
-        # Risk management
-        elif any(word in user_message for word in ["risk", "volatility", "downside", "protection", "hedging"]):
-            response = self._get_risk_management_advice()
-        
-        # Default response
-        else:
-            response = self._get_default_response(user_message)
-        
-        return {
-            "response": response,
-            "timestamp": datetime.now().isoformat(),
-            "is_ai": False,
-            "stocks_mentioned": stocks_mentioned
-        }
-    
-    def _build_stock_context(self, query: str) -> str:
-        """Build context about mentioned stocks"""
-        symbols = self._extract_stock_symbols(query)
-        context = ""
-        
-        for symbol in symbols[:3]:  # Limit to 3 stocks
-            try:
-                data = self.scraper.get_stock_data(symbol)
-                analysis = self.analyzer.analyze_stock(symbol, data)
-                
-                context += f"\n{symbol}:"
-                context += f"\n  Price: ${data.get('price', 'N/A')}"
-                context += f"\n  52W High/Low: ${data.get('52w_high', 'N/A')} / ${data.get('52w_low', 'N/A')}"
-                context += f"\n  P/E Ratio: {data.get('pe_ratio', 'N/A')}"
-                context += f"\n  Analyst Score: {analysis.get('score', 'N/A')}/100"
-            except Exception as e:
-                logger.error(f"Error getting context for {symbol}: {e}")
-        
-        return context if context else "No specific stock data available"
-    
-    def _extract_stock_symbols(self, text: str) -> List[str]:
-        """Extract stock symbols from text"""
-        # Common stock symbols pattern
-        symbols = []
-        words = text.upper().split()
-        
-        # Check for common symbols
-        common_symbols = {
-            'AAPL', 'GOOGL', 'MSFT', 'AMZN', 'NVDA', 'TSLA', 'META', 'NFLX',
-            'MRNA', 'JNJ', 'PFE', 'V', 'MA', 'JPM', 'BAC', 'GS', 'SPY', 'QQQ',
-            'IVV', 'VOO', 'VTI', 'BRK.B', 'BRKA', 'XOM', 'CVX', 'COP', 'MPC'
-        }
-        
-        for word in words:
-            word_clean = word.strip('.,!?;:')
-            if word_clean in common_symbols and word_clean not in symbols:
-                symbols.append(word_clean)
-        
-        return symbols
-    
-    def _get_recommendations(self) -> str:
-        """Get stock recommendations"""
-        return """
+
+
+# Canned rule-based responses
+_RECOMMENDATIONS_MD = """
 📊 **Stock Recommendations** (Based on Fundamental Analysis)
 
 **Strong Buy (Momentum + Value):**
@@ -210,10 +147,8 @@ Provide a helpful, detailed response focused on stock investments and analysis."
 
 ⚠️ **Risk Disclaimer:** Past performance is not indicative of future results. Always do your own research and consider your risk tolerance before investing.
 """
-    
-    def _get_sell_advice(self) -> str:
-        """Get selling strategy advice"""
-        return """
+
+_SELL_ADVICE_MD = """
 📉 **When to Sell: Key Signals & Strategies**
 
 **Fundamental Sell Signals:**
@@ -240,10 +175,8 @@ Provide a helpful, detailed response focused on stock investments and analysis."
 
 ⚠️ **Selling is as important as buying. Protecting capital matters more than chasing gains.**
 """
-    
-    def _get_short_advice(self) -> str:
-        """Get shorting strategy advice"""
-        return """
+
+_SHORT_ADVICE_MD = """
 🔻 **Shorting Strategy: When & How to Short Stocks**
 
 **Valid Short Opportunities:**
@@ -274,34 +207,8 @@ Provide a helpful, detailed response focused on stock investments and analysis."
 
 ⚠️ **Shorting is high-risk. Consider puts or inverse ETFs as safer alternatives.**
 """
-    
-    def _analyze_stocks(self, symbols: List[str]) -> str:
-        """Analyze specific stocks"""
-        response = f"📈 **Analysis for: {', '.join(symbols)}**\n\n"
-        
-        for symbol in symbols[:3]:  # Limit to 3 stocks
-            try:
-                data = self.scraper.get_stock_data(symbol)
-                if data:
-                    analysis = self.analyzer.analyze_stock(symbol, data)
-                    
-                    response += f"**{symbol}**:\n"
-                    response += f"- Price: ${data.get('price', 'N/A')}\n"
-                    response += f"- Market Cap: ${data.get('market_cap', 'N/A')}\n"
-                    response += f"- P/E Ratio: {data.get('pe_ratio', 'N/A')}\n"
-                    response += f"- Dividend Yield: {data.get('dividend_yield', 'N/A')}%\n"
-                    response += f"- Analysis Score: {analysis.get('score', 'N/A')}/100\n"
-                    response += f"- Recommendation: {analysis.get('recommendation', 'Hold')}\n\n"
-                else:
-                    response += f"**{symbol}**: Unable to fetch data (rate limit or ticker not found)\n\n"
-            except Exception as e:
-                response += f"**{symbol}**: Error during analysis ({str(e)})\n\n"
-        
-        return response
-    
-    def _get_portfolio_advice(self) -> str:
-        """Get portfolio management advice"""
-        return """
+
+_PORTFOLIO_ADVICE_MD = """
 💼 **Portfolio Management & Diversification Strategy**
 
 **Asset Allocation (Age-Based Rule of Thumb):**
@@ -334,10 +241,8 @@ Provide a helpful, detailed response focused on stock investments and analysis."
 
 ⚠️ **The best portfolio is one you can stick with through market cycles.**
 """
-    
-    def _get_market_analysis(self) -> str:
-        """Get current market analysis"""
-        return """
+
+_MARKET_ANALYSIS_MD = """
 🌍 **Current Market Analysis & Outlook**
 
 **Key Economic Indicators to Watch:**
@@ -375,10 +280,8 @@ Provide a helpful, detailed response focused on stock investments and analysis."
 
 ⚠️ **Market cycles are normal. Dollar-cost averaging smooths returns.**
 """
-    
-    def _get_risk_management_advice(self) -> str:
-        """Get risk management strategies"""
-        return """
+
+_RISK_MANAGEMENT_MD = """
 🛡️ **Risk Management & Portfolio Protection Strategies**
 
 **Understanding Risk Types:**
@@ -431,13 +334,27 @@ Provide a helpful, detailed response focused on stock investments and analysis."
 
 ⚠️ **Good risk management is about sleeping at night, not hitting homeruns.**
 """
-    
-    def _get_default_response(self, user_message: str) -> str:
-        """Get response for general questions"""
-        return f"""
+
+_CONTEXT_TEMPLATE = (
+    "\n{symbol}:"
+    "\n  Price: ${price}"
+    "\n  52W High/Low: ${high} / ${low}"
+)
+
+_ANALYSIS_TEMPLATE = (
+    "**{symbol}**:\n"
+    "- Price: ${price}\n"
+    "- Market Cap: ${market_cap}\n"
+    "- P/E Ratio: {pe_ratio}\n"
+    "- Dividend Yield: {dividend_yield}%\n"
+    "- Analysis Score: {score}/100\n"
+    "- Recommendation: {recommendation}\n\n"
+)
+
+_DEFAULT_TEMPLATE = """
 💡 **Stock Advisor Pro - Chat Assistant**
 
-I didn't quite understand your question: "{user_message}"
+I didn't quite understand your question: "{msg}"
 
 I can help you with:
 - **Stock Recommendations**: "What stocks should I buy?"
@@ -453,24 +370,480 @@ Try asking a specific question above, or mention stock symbols (AAPL, MSFT, GOOG
 """
 
 
-# Thread worker for async chatbot responses
-from PySide6.QtCore import QObject, Signal
+class StockChatbot:
+    """AI chatbot for stock recommendations and analysis"""
+    
+    MAX_SYMBOLS = 3  # Stocks looked up per message
+    SYMBOL_CACHE_TTL = 300  # Seconds quote data is reused across messages
+    SYMBOL_CACHE_SIZE = 512
+    EXACT_CACHE_SIZE = 256  # Identical re-asks answered before the semantic cache
+    
+    def __init__(self, db=None, cache=None):
+        """Initialize chatbot with database and cache"""
+        self.db = db
+        self.cache = cache
+        # Scraper and analyzer (yfinance, pandas) load on the first stock query
+        self.scraper = None
+        self.analyzer = None
+        self._scraper_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.MAX_SYMBOLS, thread_name_prefix="chatbot")
+        self._symbol_cache: "OrderedDict[str, Tuple[Dict, float]]" = OrderedDict()
+        self._symbol_cache_lock = threading.Lock()
+        self._exact_cache: "OrderedDict[str, Tuple[Dict, float, float]]" = OrderedDict()
+        self._exact_cache_lock = threading.Lock()
+        
+        # Near-duplicate questions are answered from the semantic cache
+        self.semantic_cache = SemanticCache(getattr(db, 'db_path', None))
+        
+        # Try to initialize OpenAI API
+        self.api_key = os.getenv('OPENAI_API_KEY')
+        self.use_openai = False
+        if self.api_key:
+            try:
+                from openai import OpenAI
+                self.client = OpenAI(api_key=self.api_key)
+                self.use_openai = True
+                logger.info("OpenAI API initialized successfully")
+            except Exception as e:
+                logger.warning(f"OpenAI API not available: {e}. Using rule-based responses.")
+                self.use_openai = False
+    
+    def get_response(self, user_message: str, on_token: Optional[Callable[[str], None]] = None) -> Dict:
+        """
+        Get chatbot response to user message
+        
+        Args:
+            user_message: User's question or request
+            on_token: Optional callback receiving AI response text as it streams in
+        
+        Returns:
+            Dictionary with response and metadata
+        """
+        key = user_message.strip().lower()
+        cached = self._exact_lookup(key)
+        if cached is not None:
+            return cached
+        
+        msg = self._parse_message(user_message)
+        
+        # Answers about specific symbols quote live data, so they are only reused
+        # for as long as the quotes themselves and never matched semantically
+        ttl = self.SYMBOL_CACHE_TTL if msg.symbols else self.semantic_cache.ttl
+        
+        cached, embedding = self._cache_lookup(msg)
+        if cached is not None:
+            self._exact_store(key, cached, ttl)
+            return cached
+        
+        response = None
+        
+        # Try AI response first if OpenAI available
+        if self.use_openai:
+            try:
+                response = self._get_ai_response(msg, on_token)
+            except Exception as e:
+                logger.error(f"Error getting AI response: {e}")
+                # Fall back to rule-based
+        
+        # Rule-based responses
+        if response is None:
+            response = self._get_rule_based_response(msg)
+        
+        self._cache_store(msg, embedding, response)
+        self._exact_store(key, response, ttl)
+        return response
+    
+    def _exact_lookup(self, key: str) -> Optional[Dict]:
+        """Return a copy of the response to an identical recent message, or None"""
+        with self._exact_cache_lock:
+            entry = self._exact_cache.get(key)
+            if entry is None:
+                return None
+            response, stored_at, ttl = entry
+            if time.monotonic() - stored_at >= ttl:
+                del self._exact_cache[key]
+                return None
+            self._exact_cache.move_to_end(key)
+        return {**response, "timestamp": _timestamp()}
+    
+    def _exact_store(self, key: str, response: Dict, ttl: float):
+        """Remember a response for identical re-asks for ttl seconds, evicting the least recent"""
+        with self._exact_cache_lock:
+            self._exact_cache[key] = (response, time.monotonic(), ttl)
+            self._exact_cache.move_to_end(key)
+            if len(self._exact_cache) > self.EXACT_CACHE_SIZE:
+                self._exact_cache.popitem(last=False)
+    
+    def _parse_message(self, user_message: str) -> _Msg:
+        """Normalize a message once into the forms the response paths share"""
+        raw = user_message.strip()
+        upper = raw.upper()
+        return _Msg(raw, raw.lower(), upper, _symbols_in(upper))
+    
+    def _cache_lookup(self, msg: _Msg) -> Tuple[Optional[Dict], Optional[np.ndarray]]:
+        """
+        Look up a cached response for a semantically similar message
+        
+        Messages that mention symbols bypass the semantic cache, since their
+        answers carry live quotes.
+        
+        Args:
+            msg: Parsed user message
+        
+        Returns:
+            (response with a fresh timestamp or None, message embedding or None)
+        """
+        if msg.symbols:
+            return None, None
+        try:
+            cached, embedding = self.semantic_cache.lookup(
+                msg.lower, msg.symbols
+            )
+        except Exception as e:
+            logger.error(f"Error reading semantic cache: {e}")
+            return None, None
+        
+        if cached is not None:
+            cached["timestamp"] = _timestamp()
+        return cached, embedding
+    
+    def _cache_store(self, msg: _Msg, embedding: Optional[np.ndarray], response: Dict):
+        """Store a freshly generated response in the semantic cache"""
+        try:
+            self.semantic_cache.store(msg.lower, embedding, response)
+        except Exception as e:
+            logger.error(f"Error writing semantic cache: {e}")
+    
+    def _get_ai_response(self, msg: _Msg, on_token: Optional[Callable[[str], None]] = None) -> Dict:
+        """Get response using OpenAI API, streaming tokens to on_token as they arrive"""
+        # Build context about stocks
+        context = self._build_stock_context(msg)
+        
+        user_prompt = _USER_PROMPT_TEMPLATE.format(context=context, question=msg.lower)
+        
+        response = self.client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[
+                _SYSTEM_MESSAGE,
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=0.7,
+            max_tokens=1000,
+            stream=True
+        )
+        
+        parts = []
+        for chunk in response:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                if on_token is not None:
+                    on_token(delta)
+        ai_response = "".join(parts)
+        
+        return {
+            "response": ai_response,
+            "timestamp": _timestamp(),
+            "is_ai": True,
+            "stocks_mentioned": msg.symbols
+        }
+    
+    def _get_rule_based_response(self, msg: _Msg) -> Dict:
+        """Get response using rule-based logic"""
+        stocks_mentioned = msg.symbols
+        
+        intent = _match_intent(msg.lower)
+        
+        if intent is None:
+            response = self._get_default_response(msg.lower)
+        elif intent == "analyze":
+            if stocks_mentioned:
+                response = self._analyze_stocks(stocks_mentioned)
+            else:
+                response = _ANALYZE_NEEDS_SYMBOL
+        else:
+            response = _INTENT_HANDLERS[intent](self)
+        
+        return {
+            "response": response,
+            "timestamp": _timestamp(),
+            "is_ai": False,
+            "stocks_mentioned": stocks_mentioned
+        }
+    
+    def _build_stock_context(self, msg: _Msg) -> str:
+        """Build context about mentioned stocks"""
+        symbols = msg.symbols[:self.MAX_SYMBOLS]
+        parts = []
+        
+        self._ensure_scraper()
+        for symbol, (data, error) in zip(symbols, self._fetch_price_data(symbols)):
+            if error is not None:
+                logger.error(f"Error getting context for {symbol}: {error}")
+                continue
+            if not data:
+                continue
+            
+            parts.append(_CONTEXT_TEMPLATE.format(
+                symbol=symbol,
+                price=data.get('price', 'N/A'),
+                high=data.get('52w_high', 'N/A'),
+                low=data.get('52w_low', 'N/A')
+            ))
+        
+        return "".join(parts) if parts else "No specific stock data available"
+    
+    def _ensure_scraper(self):
+        """Import and create the scraper and analyzer on first use"""
+        if self.analyzer is not None:
+            return
+        with self._scraper_lock:
+            if self.analyzer is None:
+                from scrapers.stock_scraper import StockScraper
+                from analyzers.fundamental_analyzer import FundamentalAnalyzer
+                self.scraper = StockScraper()
+                self.analyzer = FundamentalAnalyzer()
+    
+    def _fetch_price_data(self, symbols: List[str]) -> List[Tuple[Optional[Dict], Optional[Exception]]]:
+        """
+        Fetch price and 52-week range for several symbols
+        
+        Symbols with a cached full quote are served from it; the rest go out in
+        one batch request. Batch results carry prices only, so they are used for
+        this message and never cached. Symbols the batch did not return fall
+        back to the full quote path.
+        
+        Args:
+            symbols: Stock symbols to look up
+        
+        Returns:
+            (data, error) per symbol, in the order given
+        """
+        cached = {}
+        for symbol in symbols:
+            data = self._get_cached_stock_data(symbol)
+            if data is not None:
+                cached[symbol] = data
+        
+        missing = [symbol for symbol in symbols if symbol not in cached]
+        batch = self.scraper.get_stock_data_batch(missing) if missing else {}
+        fallback = [symbol for symbol in missing if symbol not in batch]
+        fetched = dict(zip(fallback, self._fetch_stock_data(fallback)))
+        
+        results = []
+        for symbol in symbols:
+            data = cached.get(symbol) or batch.get(symbol)
+            results.append((data, None) if data is not None else fetched[symbol])
+        return results
+    
+    def _fetch_stock_data(self, symbols: List[str]) -> List[Tuple[Optional[Dict], Optional[Exception]]]:
+        """
+        Fetch full quote data for several symbols concurrently
+        
+        Args:
+            symbols: Stock symbols to look up
+        
+        Returns:
+            (data, error) per symbol, in the order given
+        """
+        futures = [self._executor.submit(self._get_stock_data_cached, symbol) for symbol in symbols]
+        results = []
+        for future in futures:
+            try:
+                results.append((future.result(), None))
+            except Exception as e:
+                results.append((None, e))
+        return results
+    
+    def _get_stock_data_cached(self, symbol: str) -> Dict:
+        """Get quote data for one symbol, served from the symbol cache when fresh"""
+        data = self._get_cached_stock_data(symbol)
+        if data is None:
+            data = self.scraper.get_stock_data(symbol)
+            self._set_cached_stock_data(symbol, data)
+        return data
+    
+    def _get_cached_stock_data(self, symbol: str) -> Optional[Dict]:
+        """Return cached quote data younger than SYMBOL_CACHE_TTL, or None"""
+        now = time.monotonic()
+        with self._symbol_cache_lock:
+            entry = self._symbol_cache.get(symbol)
+            if entry is not None:
+                data, fetched_at = entry
+                if now - fetched_at < self.SYMBOL_CACHE_TTL:
+                    self._symbol_cache.move_to_end(symbol)
+                    return data
+                del self._symbol_cache[symbol]
+        
+        # Fall back to the shared on-disk cache, which outlives the process
+        if self.cache is not None:
+            stored = self.cache.get(f"chat_quote_{symbol}")
+            if stored and time.time() - stored.get('fetched_at', 0) < self.SYMBOL_CACHE_TTL:
+                with self._symbol_cache_lock:
+                    self._symbol_cache[symbol] = (stored['data'], now)
+                return stored['data']
+        return None
+    
+    def _set_cached_stock_data(self, symbol: str, data: Dict):
+        """Cache quote data for a symbol in memory and in the shared cache"""
+        if not data:
+            return
+        with self._symbol_cache_lock:
+            self._symbol_cache[symbol] = (data, time.monotonic())
+            self._symbol_cache.move_to_end(symbol)
+            while len(self._symbol_cache) > self.SYMBOL_CACHE_SIZE:
+                self._symbol_cache.popitem(last=False)
+        if self.cache is not None:
+            self.cache.set(f"chat_quote_{symbol}", {'data': data, 'fetched_at': time.time()})
+    
+    def _fetch_stock_analysis(self, symbol: str) -> Tuple[Dict, Dict]:
+        """
+        Fetch the full quote and financials for one symbol and score them
+        
+        The score is FundamentalAnalyzer's quality score; the recommendation
+        uses the same 70/50 cut-offs as its investment thesis.
+        """
+        import pandas as pd
+        
+        data = self._get_stock_data_cached(symbol)
+        if not data:
+            return data, {}
+        financials = self.scraper.get_financial_data(symbol)
+        score, _ = self.analyzer.calculate_quality_score(data, financials, pd.DataFrame())
+        if score >= 70:
+            recommendation = 'Buy'
+        elif score >= 50:
+            recommendation = 'Hold'
+        else:
+            recommendation = 'Sell'
+        return data, {'score': round(score, 1), 'recommendation': recommendation}
+    
+    def _fetch_stock_analyses(self, symbols: List[str]) -> List[Tuple[Optional[Dict], Optional[Dict], Optional[Exception]]]:
+        """
+        Fetch data and run the fundamental analysis for several symbols concurrently
+        
+        Args:
+            symbols: Stock symbols to look up
+        
+        Returns:
+            (data, analysis, error) per symbol, in the order given
+        """
+        self._ensure_scraper()
+        futures = [self._executor.submit(self._fetch_stock_analysis, symbol) for symbol in symbols]
+        results = []
+        for future in futures:
+            try:
+                data, analysis = future.result()
+                results.append((data, analysis, None))
+            except Exception as e:
+                results.append((None, None, e))
+        return results
+    
+    def _extract_stock_symbols(self, text: str) -> List[str]:
+        """Extract stock symbols from text"""
+        return _symbols_in(text.upper())
+    
+    def _get_recommendations(self) -> str:
+        """Get stock recommendations"""
+        return _RECOMMENDATIONS_MD
+    
+    def _get_sell_advice(self) -> str:
+        """Get selling strategy advice"""
+        return _SELL_ADVICE_MD
+    
+    def _get_short_advice(self) -> str:
+        """Get shorting strategy advice"""
+        return _SHORT_ADVICE_MD
+    
+    def _analyze_stocks(self, symbols: List[str]) -> str:
+        """Analyze specific stocks"""
+        parts = [f"📈 **Analysis for: {', '.join(symbols)}**\n\n"]
+        
+        symbols = symbols[:self.MAX_SYMBOLS]
+        for symbol, (data, analysis, error) in zip(symbols, self._fetch_stock_analyses(symbols)):
+            if error is not None:
+                parts.append(f"**{symbol}**: Error during analysis ({str(error)})\n\n")
+            elif data:
+                parts.append(_ANALYSIS_TEMPLATE.format(
+                    symbol=symbol,
+                    price=data.get('price', 'N/A'),
+                    market_cap=data.get('market_cap', 'N/A'),
+                    pe_ratio=data.get('pe_ratio', 'N/A'),
+                    dividend_yield=data.get('dividend_yield', 'N/A'),
+                    score=analysis.get('score', 'N/A'),
+                    recommendation=analysis.get('recommendation', 'Hold')
+                ))
+            else:
+                parts.append(f"**{symbol}**: Unable to fetch data (rate limit or ticker not found)\n\n")
+        
+        return "".join(parts)
+    
+    def _get_portfolio_advice(self) -> str:
+        """Get portfolio management advice"""
+        return _PORTFOLIO_ADVICE_MD
+    
+    def _get_market_analysis(self) -> str:
+        """Get current market analysis"""
+        return _MARKET_ANALYSIS_MD
+    
+    def _get_risk_management_advice(self) -> str:
+        """Get risk management strategies"""
+        return _RISK_MANAGEMENT_MD
+    
+    def _get_default_response(self, user_message: str) -> str:
+        """Get response for general questions"""
+        return _DEFAULT_TEMPLATE.format(msg=user_message)
+
+
+# Rule-based handlers for intents that need no arguments
+_INTENT_HANDLERS = {
+    "recommend": StockChatbot._get_recommendations,
+    "sell": StockChatbot._get_sell_advice,
+    "short": StockChatbot._get_short_advice,
+    "portfolio": StockChatbot._get_portfolio_advice,
+    "market": StockChatbot._get_market_analysis,
+    "risk": StockChatbot._get_risk_management_advice,
+}
+
+
+# Thread pool worker for async chatbot responses
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+class _ChatbotTask(QRunnable):
+    """Runnable that answers one message on a pool thread"""
+    
+    def __init__(self, worker: "ChatbotWorker", message: str):
+        super().__init__()
+        self.worker = worker
+        self.message = message
+    
+    def run(self):
+        self.worker._handle_message(self.message)
 
 
 class ChatbotWorker(QObject):
-    """Worker thread for chatbot responses"""
+    """Worker that answers chatbot messages on a shared thread pool"""
     
     response_ready = Signal(dict)
+    token_received = Signal(str)
     error_occurred = Signal(str)
     
-    def __init__(self, chatbot: StockChatbot):
+    def __init__(self, chatbot: StockChatbot, pool: Optional[QThreadPool] = None):
         super().__init__()
         self.chatbot = chatbot
+        self.pool = pool or QThreadPool.globalInstance()
     
     def process_message(self, message: str):
+        """Queue a message; the response is emitted from a pool thread"""
+        self.pool.start(_ChatbotTask(self, message))
+    
+    def _handle_message(self, message: str):
         """Process message and emit response"""
         try:
-            response = self.chatbot.get_response(message)
+            response = self.chatbot.get_response(message, on_token=self.token_received.emit)
             self.response_ready.emit(response)
         except Exception as e:
             logger.error(f"Error in chatbot worker: {e}")
@@ -3,15 +3,38 @@ Custom Alert Engine Service
 Advanced alert conditions with AND/OR logic and multi-channel notifications
 """
 
-from typing import List, Dict, Optional
+from typing import Callable, Iterable, List, Dict, Optional, Set, Tuple
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
+import bisect
+import heapq
+import itertools
 import json
+import os
+import secrets
 import sqlite3
-import hashlib
 import threading
 import time
 
+import numpy as np
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    
+    def _json_dumps(obj) -> str:
+        """orjson encodes straight to bytes; the column stores text"""
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _json_loads = json.loads
+    
+    def _json_dumps(obj) -> str:
+        """Compact separators, matching orjson's output"""
+        return json.dumps(obj, separators=(',', ':'))
+
 from utils.base_service import BaseService
+from utils.jit import njit
 from utils.data_models import (
     AlertCondition, AlertTemplate, AlertRule, AlertEvent,
     AlertConditionType, LogicOperator, NotificationChannel, AlertSeverity
@@ -19,97 +42,461 @@ from utils.data_models import (
 from services.notification_handlers import NotificationHandler, EmailNotificationHandler, WebhookNotificationHandler, PushNotificationHandler, InAppNotificationHandler
 
 
+HISTORY_SIZE = 100  # Price ticks kept per symbol
+
+MAX_EVENTS_IN_MEMORY = 10_000  # Older events are served from the alert_events table
+EVENT_BATCH_SIZE = 100  # Queued events that wake the writer early
+EVENT_FLUSH_INTERVAL = 0.25  # Seconds between background event flushes
+EVAL_BATCH_SIZE = 64  # Due rules per evaluation pool task
+NOTIFY_WORKERS = 16  # Concurrent notification deliveries
+MAX_PENDING_NOTIFICATIONS = 64  # Queued plus running sends before triggering waits
+NOTIFY_RECIPIENT = "user@example.com"
+
+# Fixed SQL text, so every write hits the connection's prepared-statement cache
+_SAVE_RULE_SQL = "INSERT OR REPLACE INTO alert_rules VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+_INSERT_EVENT_SQL = "INSERT INTO alert_events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+_DELETE_RULE_SQL = "DELETE FROM alert_rules WHERE id = ?"
+_EMPTY_JSON = "{}"  # Most events carry no triggered_values
+
+
+def _new_id() -> str:
+    """Random 32-character hex id for templates, rules and events"""
+    return secrets.token_hex(16)
+
+# Small-int codes for the condition types handled by the numeric kernel
+_COND_PRICE_ABOVE = 0
+_COND_PRICE_BELOW = 1
+_COND_PRICE_CHANGE_PERCENT = 2
+_COND_VOLUME_SPIKE = 3
+_COND_RSI_OVERSOLD = 4
+_COND_RSI_OVERBOUGHT = 5
+
+_CONDITION_CODES = {
+    AlertConditionType.PRICE_ABOVE: _COND_PRICE_ABOVE,
+    AlertConditionType.PRICE_BELOW: _COND_PRICE_BELOW,
+    AlertConditionType.PRICE_CHANGE_PERCENT: _COND_PRICE_CHANGE_PERCENT,
+    AlertConditionType.VOLUME_SPIKE: _COND_VOLUME_SPIKE,
+    AlertConditionType.RSI_OVERSOLD: _COND_RSI_OVERSOLD,
+    AlertConditionType.RSI_OVERBOUGHT: _COND_RSI_OVERBOUGHT,
+}
+
+# Parameter holding each type's threshold, with its default
+_THRESHOLD_PARAMS = {
+    _COND_PRICE_ABOVE: ('threshold', 0),
+    _COND_PRICE_BELOW: ('threshold', 0),
+    _COND_PRICE_CHANGE_PERCENT: ('percent', 0),
+    _COND_VOLUME_SPIKE: ('threshold', 0),
+    _COND_RSI_OVERSOLD: ('threshold', 30),
+    _COND_RSI_OVERBOUGHT: ('threshold', 70),
+}
+
+# Names of the two numbers the kernel reports for each type
+_VALUE_KEYS = {
+    _COND_PRICE_ABOVE: ('current_price', 'threshold'),
+    _COND_PRICE_BELOW: ('current_price', 'threshold'),
+    _COND_PRICE_CHANGE_PERCENT: ('percent_change', 'threshold'),
+    _COND_VOLUME_SPIKE: ('current_volume', 'avg_volume'),
+    _COND_RSI_OVERSOLD: ('rsi', 'threshold'),
+    _COND_RSI_OVERBOUGHT: ('rsi', 'threshold'),
+}
+
+_DIRECTION_CODES = {'up': 1, 'down': -1}  # Anything else means either direction
+
+# Relative evaluation cost; templates check cheap conditions first so AND/OR
+# short-circuit before reaching history scans or (eventually) IO-bound types
+_CONDITION_COSTS = {
+    _COND_PRICE_ABOVE: 0,
+    _COND_PRICE_BELOW: 0,
+    _COND_RSI_OVERSOLD: 0,
+    _COND_RSI_OVERBOUGHT: 0,
+    _COND_PRICE_CHANGE_PERCENT: 1,
+    _COND_VOLUME_SPIKE: 2,
+}
+_DEFAULT_CONDITION_COST = 3
+
+_NO_HISTORY = np.zeros(HISTORY_SIZE, dtype=np.float64)
+
+
+@njit(cache=True)
+def _eval_numeric(cond_type, current, threshold, prices, volumes, head, length,
+                  multiplier, rsi, direction):
+    """
+    Numeric core of the built-in condition types
+    
+    prices and volumes are ring buffers sharing head (next write slot) and
+    length (valid ticks). Returns (has_data, is_met, value, reference), where
+    value and reference are the two numbers reported for the condition type.
+    """
+    if cond_type == _COND_PRICE_ABOVE:
+        return True, current > threshold, current, threshold
+    if cond_type == _COND_PRICE_BELOW:
+        return True, current < threshold, current, threshold
+    
+    if cond_type == _COND_PRICE_CHANGE_PERCENT:
+        if length < 2:
+            return False, False, 0.0, 0.0
+        old_price = prices[(head - length) % prices.shape[0]]
+        new_price = prices[head - 1]
+        if old_price == 0:
+            return False, False, 0.0, 0.0  # No meaningful baseline to compare against
+        percent_change = ((new_price - old_price) / old_price) * 100.0
+        if direction > 0:
+            is_met = percent_change > threshold
+        elif direction < 0:
+            is_met = percent_change < -threshold
+        else:
+            is_met = abs(percent_change) > threshold
+        return True, is_met, percent_change, threshold
+    
+    if cond_type == _COND_VOLUME_SPIKE:
+        if length < 20:
+            return False, False, 0.0, 0.0
+        current_volume = volumes[head - 1]
+        avg_volume = (volumes[:length].sum() - current_volume) / (length - 1)
+        return True, current_volume > avg_volume * multiplier, current_volume, avg_volume
+    
+    if cond_type == _COND_RSI_OVERSOLD:
+        return True, rsi < threshold, rsi, threshold
+    if cond_type == _COND_RSI_OVERBOUGHT:
+        return True, rsi > threshold, rsi, threshold
+    return False, False, 0.0, 0.0
+
+
+@njit(cache=True)
+def _eval_numeric_many(params, idx, price, price_history, volume_history, head, length):
+    """
+    Run _eval_numeric over many conditions
+    
+    params holds one (code, threshold, multiplier, rsi, direction) row per
+    condition and idx its symbol table row. Returns a bool array, True where
+    the condition has data and is met.
+    """
+    out = np.zeros(idx.shape[0], dtype=np.bool_)
+    for k in range(idx.shape[0]):
+        i = idx[k]
+        has_data, is_met, _, _ = _eval_numeric(
+            int(params[k, 0]), price[i], params[k, 1], price_history[i], volume_history[i],
+            head[i], length[i], params[k, 2], params[k, 3], int(params[k, 4])
+        )
+        out[k] = has_data and is_met
+    return out
+
+
+def warm_up_kernels():
+    """Compile (or load from the numba cache) the numeric kernels ahead of the first evaluation"""
+    _eval_numeric(_COND_PRICE_ABOVE, 0.0, 0.0, _NO_HISTORY, _NO_HISTORY, 0, 0, 0.0, 0.0, 0)
+    _eval_numeric_many(np.zeros((1, 5)), np.zeros(1, dtype=np.int64), np.zeros(1),
+                       np.zeros((1, HISTORY_SIZE)), np.zeros((1, HISTORY_SIZE)),
+                       np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64))
+
+
+class SymbolTable:
+    """
+    Per-symbol market state in structure-of-arrays form
+    
+    Each symbol gets a stable row index on first sight. Prices, volumes and
+    their HISTORY_SIZE-tick ring buffers live in contiguous arrays indexed by
+    that row; head is the next write slot and length the number of valid ticks.
+    
+    Writes and growth happen under the table lock; readers take no lock and
+    always see fully populated arrays, since grown arrays are only published
+    after the existing rows have been copied into them.
+    """
+    
+    INITIAL_CAPACITY = 64
+    
+    def __init__(self):
+        self._symbol_idx: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        (self.price, self.volume, self.price_history, self.volume_history,
+         self.head, self.length) = self._allocate(self.INITIAL_CAPACITY)
+    
+    @staticmethod
+    def _allocate(capacity: int) -> Tuple[np.ndarray, ...]:
+        """Allocate empty arrays for `capacity` symbols"""
+        return (
+            np.zeros(capacity, dtype=np.float64),
+            np.zeros(capacity, dtype=np.float64),
+            np.zeros((capacity, HISTORY_SIZE), dtype=np.float64),
+            np.zeros((capacity, HISTORY_SIZE), dtype=np.float64),
+            np.zeros(capacity, dtype=np.int64),
+            np.zeros(capacity, dtype=np.int64),
+        )
+    
+    def _grow(self):
+        """Double the capacity, keeping existing rows (lock must be held)"""
+        old = (self.price, self.volume, self.price_history, self.volume_history, self.head, self.length)
+        size = old[0].shape[0]
+        new = self._allocate(size * 2)
+        for new_array, old_array in zip(new, old):
+            new_array[:size] = old_array
+        (self.price, self.volume, self.price_history, self.volume_history,
+         self.head, self.length) = new
+    
+    def _assign(self, symbol: str) -> int:
+        """Give a new symbol the next free row (lock must be held)"""
+        idx = self._symbol_idx.get(symbol)
+        if idx is None:
+            idx = len(self._symbol_idx)
+            if idx == self.price.shape[0]:
+                self._grow()
+            self._symbol_idx[symbol] = idx
+        return idx
+    
+    def lookup(self, symbol: str) -> Optional[int]:
+        """Row index of a symbol, or None if it has never been seen"""
+        return self._symbol_idx.get(symbol)
+    
+    def index(self, symbol: str) -> int:
+        """Row index of a symbol, assigning an empty row on first use"""
+        idx = self._symbol_idx.get(symbol)
+        if idx is None:
+            with self._lock:
+                idx = self._assign(symbol)
+        return idx
+    
+    def record(self, symbol: str, price: float, volume: float):
+        """Store a tick for a symbol, assigning it a row on first use"""
+        with self._lock:
+            idx = self._symbol_idx.get(symbol)
+            if idx is None:
+                idx = self._assign(symbol)
+            head = self.head[idx]
+            
+            self.price[idx] = price
+            self.volume[idx] = volume
+            self.price_history[idx, head] = price
+            self.volume_history[idx, head] = volume
+            self.head[idx] = (head + 1) % HISTORY_SIZE
+            if self.length[idx] < HISTORY_SIZE:
+                self.length[idx] += 1
+
+
 class ConditionEvaluator:
     """Evaluates alert conditions against current data"""
     
     def __init__(self):
-        self.current_prices: Dict[str, float] = {}
-        self.price_history: Dict[str, List[float]] = {}
-        self.volumes: Dict[str, float] = {}
+        self.symbols = SymbolTable()
+        
+        # Symbols updated since the monitoring loop last looked
+        self._dirty_symbols: Set[str] = set()
+        self._dirty_lock = threading.Lock()
     
     def update_price(self, symbol: str, price: float, volume: float = 0):
         """Update current price and volume"""
-        self.current_prices[symbol] = price
-        self.volumes[symbol] = volume
+        self.symbols.record(symbol, price, volume)
+        
+        with self._dirty_lock:
+            self._dirty_symbols.add(symbol)
+    
+    def mark_dirty(self, symbols: Iterable[str]):
+        """Flag symbols for the monitoring loop's next look without new data"""
+        with self._dirty_lock:
+            self._dirty_symbols.update(symbols)
+    
+    def take_dirty_symbols(self) -> Set[str]:
+        """Return and reset the symbols updated since the previous call"""
+        with self._dirty_lock:
+            dirty, self._dirty_symbols = self._dirty_symbols, set()
+        return dirty
+    
+    def _view(self, symbol: str, n: Optional[int] = None) -> np.ndarray:
+        """
+        Recent price history for a symbol in oldest-to-newest order
         
-        if symbol not in self.price_history:
-            self.price_history[symbol] = []
-        self.price_history[symbol].append(price)
+        Args:
+            symbol: Stock symbol
+            n: Number of most recent prices to return, all stored prices by default
         
-        if len(self.price_history[symbol]) > 100:
-            self.price_history[symbol] = self.price_history[symbol][-100:]
+        Returns:
+            A view into the ring buffer when the window does not wrap, else a copy
+        """
+        table = self.symbols
+        idx = table.lookup(symbol)
+        if idx is None:
+            return np.empty(0, dtype=np.float64)
+        length = int(table.length[idx])
+        n = length if n is None else max(0, min(n, length))
+        buf = table.price_history[idx]
+        head = int(table.head[idx])
+        start = head - n
+        if start >= 0:
+            return buf[start:head]
+        if head == 0:
+            return buf[start:]
+        return np.concatenate((buf[start:], buf[:head]))
     
     def evaluate_condition(self, condition: AlertCondition, 
                          values: Dict = None) -> tuple[bool, Dict]:
         """Evaluate if condition is met. Returns: (is_met, triggered_values)"""
-        symbol = condition.symbol
-        params = condition.parameters
-        triggered_values = {}
-        
+        handler = EVALUATORS.get(condition.type)
+        if handler is None:
+            return False, {}  # No evaluator for this type yet, it never triggers
         try:
-            if condition.type == AlertConditionType.PRICE_ABOVE:
-                current = self.current_prices.get(symbol, 0)
-                threshold = params.get('threshold', 0)
-                is_met = current > threshold
-                triggered_values = {'current_price': current, 'threshold': threshold}
-            
-            elif condition.type == AlertConditionType.PRICE_BELOW:
-                current = self.current_prices.get(symbol, 0)
-                threshold = params.get('threshold', 0)
-                is_met = current < threshold
-                triggered_values = {'current_price': current, 'threshold': threshold}
-            
-            elif condition.type == AlertConditionType.PRICE_CHANGE_PERCENT:
-                history = self.price_history.get(symbol, [])
-                if len(history) < 2:
-                    return False, {}
-                old_price, new_price = history[0], history[-1]
-                percent_change = ((new_price - old_price) / old_price) * 100
-                threshold = params.get('percent', 0)
-                direction = params.get('direction', 'either')
-                
-                if direction == 'up':
-                    is_met = percent_change > threshold
-                elif direction == 'down':
-                    is_met = percent_change < -threshold
-                else:
-                    is_met = abs(percent_change) > threshold
-                triggered_values = {'percent_change': percent_change, 'threshold': threshold}
-            
-            elif condition.type == AlertConditionType.VOLUME_SPIKE:
-                history = self.price_history.get(symbol, [])
-                volumes = [self.volumes.get(symbol, 0)] * len(history)
-                if len(volumes) < 20:
-                    return False, {}
-                avg_volume = sum(volumes[:-1]) / (len(volumes) - 1)
-                current_volume = volumes[-1]
-                multiplier = params.get('multiplier', 2)
-                is_met = current_volume > (avg_volume * multiplier)
-                triggered_values = {'current_volume': current_volume, 'avg_volume': avg_volume}
-            
-            elif condition.type == AlertConditionType.RSI_OVERSOLD:
-                rsi = params.get('rsi_value', 0)
-                threshold = params.get('threshold', 30)
-                is_met = rsi < threshold
-                triggered_values = {'rsi': rsi, 'threshold': threshold}
-            
-            elif condition.type == AlertConditionType.RSI_OVERBOUGHT:
-                rsi = params.get('rsi_value', 0)
-                threshold = params.get('threshold', 70)
-                is_met = rsi > threshold
-                triggered_values = {'rsi': rsi, 'threshold': threshold}
-            
-            elif condition.type == AlertConditionType.NEWS_KEYWORD:
-                keyword = params.get('keyword', '')
-                is_met = False
-                triggered_values = {'keyword': keyword}
-            
-            else:
-                is_met = False
-            
-            return is_met, triggered_values
+            return handler(self, condition, condition.parameters)
         except Exception as e:
             return False, {}
+    
+    def _symbol_index(self, condition: AlertCondition) -> int:
+        """Symbol table row for a condition, cached per (condition, table)"""
+        # Conditions can outlive an evaluator, so the table is part of the cache key
+        table = self.symbols
+        slot = getattr(condition, '_sym_slot', None)
+        if slot is None or slot[0] is not table:
+            slot = condition._sym_slot = (table, table.index(condition.symbol))
+        return slot[1]
+    
+    def evaluate_many(self, conditions: List[AlertCondition]) -> np.ndarray:
+        """
+        Evaluate many conditions at once
+        
+        Built-in numeric conditions run through the same compiled kernel as
+        evaluate_condition in a single call; any other type falls back to
+        evaluate_condition.
+        
+        Args:
+            conditions: Conditions to evaluate
+        
+        Returns:
+            Boolean array aligned with `conditions`
+        """
+        met = np.zeros(len(conditions), dtype=bool)
+        positions, rows, indices = [], [], []
+        for pos, condition in enumerate(conditions):
+            row = _numeric_row(condition)
+            if row is None:
+                met[pos] = self.evaluate_condition(condition)[0]
+                continue
+            positions.append(pos)
+            rows.append(row)
+            indices.append(self._symbol_index(condition))
+        if rows:
+            met[positions] = self._numeric_batch(np.array(rows, dtype=np.float64),
+                                                 np.array(indices, dtype=np.int64))
+        return met
+    
+    def _numeric_batch(self, params: np.ndarray, idx: np.ndarray) -> np.ndarray:
+        """
+        Evaluate built-in numeric conditions with the compiled kernel
+        
+        Args:
+            params: (n, 5) rows of (code, threshold, multiplier, rsi, direction)
+            idx: Symbol table row of each condition
+        
+        Returns:
+            Boolean array, True where the condition is met
+        """
+        table = self.symbols
+        return _eval_numeric_many(params, idx, table.price, table.price_history,
+                                  table.volume_history, table.head, table.length)
+    
+    def _handle_numeric(self, condition: AlertCondition, params: Dict) -> tuple[bool, Dict]:
+        """Run a built-in numeric condition through the compiled kernel"""
+        code = getattr(condition, '_type_int', None)
+        if code is None:
+            code = condition._type_int = _CONDITION_CODES[condition.type]
+        
+        table = self.symbols
+        idx = self._symbol_index(condition)
+        param, default = _THRESHOLD_PARAMS[code]
+        
+        has_data, is_met, value, reference = _eval_numeric(
+            code,
+            float(table.price[idx]),
+            float(params.get(param, default)),
+            table.price_history[idx], table.volume_history[idx],
+            int(table.head[idx]),
+            int(table.length[idx]),
+            float(params.get('multiplier', 2)),
+            float(params.get('rsi_value', 0)),
+            _DIRECTION_CODES.get(params.get('direction', 'either'), 0)
+        )
+        if not has_data:
+            return False, {}
+        value_key, reference_key = _VALUE_KEYS[code]
+        return bool(is_met), {value_key: float(value), reference_key: float(reference)}
+    
+    def _handle_news_keyword(self, condition: AlertCondition, params: Dict) -> tuple[bool, Dict]:
+        """News matching is not wired up yet; report the keyword only"""
+        return False, {'keyword': params.get('keyword', '')}
+
+
+# Condition type -> handler(evaluator, condition, params) -> (is_met, triggered_values),
+# so dispatch is a single dict lookup; types missing here never trigger
+EVALUATORS: Dict[AlertConditionType, Callable[[ConditionEvaluator, AlertCondition, Dict], Tuple[bool, Dict]]] = {
+    **dict.fromkeys(_CONDITION_CODES, ConditionEvaluator._handle_numeric),
+    AlertConditionType.NEWS_KEYWORD: ConditionEvaluator._handle_news_keyword,
+}
+
+
+def _compile_condition(condition: AlertCondition) -> Callable[[ConditionEvaluator], bool]:
+    """Bind a condition to its handler once, keeping evaluate_condition's error handling"""
+    handler = EVALUATORS.get(condition.type)
+    if handler is None:
+        return lambda evaluator: False
+    
+    def check(evaluator: ConditionEvaluator) -> bool:
+        try:
+            return handler(evaluator, condition, condition.parameters)[0]
+        except Exception:
+            return False
+    return check
+
+
+def _numeric_row(condition: AlertCondition) -> Optional[Tuple[float, ...]]:
+    """Parameters of a built-in numeric condition as an evaluate_many row, read live"""
+    code = _CONDITION_CODES.get(condition.type)
+    if code is None:
+        return None
+    params = condition.parameters
+    param, default = _THRESHOLD_PARAMS[code]
+    try:
+        return (code, float(params.get(param, default)),
+                float(params.get('multiplier', 2)), float(params.get('rsi_value', 0)),
+                _DIRECTION_CODES.get(params.get('direction', 'either'), 0))
+    except (TypeError, ValueError):
+        return None  # evaluate_condition reports malformed parameters as not met
+
+
+def _logic_met(logic_operator: LogicOperator, outcomes: Iterable[bool]) -> bool:
+    """
+    Apply a template's AND/OR to its condition outcomes
+    
+    outcomes is consumed lazily, so checks stop as soon as the result is
+    known. A template with no enabled conditions never triggers.
+    """
+    if logic_operator == LogicOperator.AND:
+        seen = False
+        for met in outcomes:
+            if not met:
+                return False
+            seen = True
+        return seen
+    return any(outcomes)
+
+
+def _compile_template(template: AlertTemplate):
+    """
+    Specialize a template's conditions and logic into a single callable
+    
+    Caches on the template the enabled conditions, the symbols they watch and
+    _compiled_eval(evaluator) -> bool, which short-circuits cheapest condition first.
+    """
+    for condition in template.conditions:
+        condition._type_int = _CONDITION_CODES.get(condition.type, -1)
+    conditions = tuple(sorted(
+        (c for c in template.conditions if c.enabled),
+        key=lambda c: _CONDITION_COSTS.get(c._type_int, _DEFAULT_CONDITION_COST)
+    ))
+    checks = tuple(_compile_condition(c) for c in conditions)
+    logic_operator = template.logic_operator
+    
+    def compiled_eval(evaluator):
+        return _logic_met(logic_operator, (check(evaluator) for check in checks))
+    
+    template._enabled_conditions = conditions
+    template._symbols = frozenset(c.symbol for c in conditions)
+    template._compiled_eval = compiled_eval
 
 
 class CustomAlertEngine(BaseService):
@@ -120,8 +507,26 @@ class CustomAlertEngine(BaseService):
         self.db_path = db_path
         self.rules: Dict[str, AlertRule] = {}
         self.templates: Dict[str, AlertTemplate] = {}
-        self.alert_events: List[AlertEvent] = []
+        self.alert_events: deque = deque(maxlen=MAX_EVENTS_IN_MEMORY)
+        self._events_by_id: Dict[str, AlertEvent] = {}
+        self._event_times: deque = deque(maxlen=MAX_EVENTS_IN_MEMORY)  # triggered_at of each alert_events entry
         self.evaluator = ConditionEvaluator()
+        warm_up_kernels()  # Loads the cached kernel now instead of on the first evaluation
+        
+        # Running statistics, kept in step with alert_events
+        self._unread_count = 0
+        self._severity_counts: Counter = Counter()
+        self._events_last_24h: deque = deque()  # (trigger time.monotonic(), event id)
+        self._enabled_rule_count = 0
+        
+        # rule.symbol -> {rule id: rule}, and condition symbol -> rules watching it
+        self._rules_by_symbol: Dict[str, Dict[str, AlertRule]] = {}
+        self._rules_by_watched_symbol: Dict[str, Dict[str, AlertRule]] = {}
+        
+        # Rules outside their cooldown; the rest wait in a heap of
+        # (next eligible time.monotonic(), rule id)
+        self._active_rules: Dict[str, AlertRule] = {}
+        self._cooldown_heap: List[Tuple[float, str]] = []
         
         # Notification handlers
         self.handlers = {
@@ -130,32 +535,66 @@ class CustomAlertEngine(BaseService):
             NotificationChannel.PUSH: PushNotificationHandler(),
             NotificationChannel.IN_APP: InAppNotificationHandler(),
         }
+        self._handlers_version = 0  # Bumped by set_handler to invalidate per-template bindings
         
         self.is_running = False
         self.check_thread = None
+        
+        # Large ticks are split into batches evaluated concurrently, and notifications are
+        # delivered off the monitoring thread; _state_lock guards the event history,
+        # counters and cooldown structures
+        self._eval_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="alert-eval")
+        self._notify_pool = ThreadPoolExecutor(max_workers=NOTIFY_WORKERS, thread_name_prefix="alert-notify")
+        self._notify_slots = threading.BoundedSemaphore(MAX_PENDING_NOTIFICATIONS)
+        self._state_lock = threading.Lock()
+        
+        # One long-lived autocommit connection per thread; WAL lets the writer
+        # thread and UI readers work without blocking each other
+        self._tls = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
         self._init_db()
+        
+        # Events are queued as rows and written in batches off the monitoring thread
+        self._event_queue: deque = deque()
+        self._flush_event = threading.Event()
+        self._writer_stop = threading.Event()
+        self._writer_thread = threading.Thread(target=self._db_writer_loop, daemon=True)
+        self._writer_thread.start()
+    
+    def _conn(self) -> sqlite3.Connection:
+        """This thread's alert database connection, opened on first use"""
+        conn = getattr(self._tls, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            self._tls.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
     
     def _init_db(self):
         """Initialize database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        conn = self._conn()
         
-        cursor.execute("""
+        conn.execute("""
             CREATE TABLE IF NOT EXISTS alert_rules (
                 id TEXT PRIMARY KEY, template_id TEXT, symbol TEXT,
                 enabled BOOLEAN, triggered_count INTEGER, last_triggered TIMESTAMP,
                 cooldown_minutes INTEGER, created_at TIMESTAMP)
         """)
         
-        cursor.execute("""
+        conn.execute("""
             CREATE TABLE IF NOT EXISTS alert_events (
                 id TEXT PRIMARY KEY, rule_id TEXT, symbol TEXT, severity TEXT,
                 message TEXT, triggered_at TIMESTAMP, triggered_values TEXT,
                 read BOOLEAN, acknowledged BOOLEAN)
         """)
         
-        conn.commit()
-        conn.close()
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_events_time_sym ON alert_events(triggered_at DESC, symbol)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_rules_symbol ON alert_rules(symbol)")
     
     def create_alert_template(self, name: str, description: str,
                             conditions: List[AlertCondition],
@@ -163,70 +602,252 @@ class CustomAlertEngine(BaseService):
                             severity: AlertSeverity,
                             channels: List[NotificationChannel]) -> AlertTemplate:
         """Create an alert template"""
-        template_id = hashlib.md5(f"{name}{datetime.now()}".encode()).hexdigest()
+        template_id = _new_id()
         template = AlertTemplate(id=template_id, name=name, description=description,
                                 conditions=conditions, logic_operator=logic,
                                 severity=severity, notification_channels=channels)
+        _compile_template(template)
+        self._resolved_handlers(template)
         self.templates[template_id] = template
         return template
     
+    def set_handler(self, channel: NotificationChannel, handler: NotificationHandler):
+        """Install the handler for a channel, replacing any existing one"""
+        self.handlers[channel] = handler
+        self._handlers_version += 1
+    
+    def _resolved_handlers(self, template: AlertTemplate) -> Tuple[Tuple[NotificationHandler, str], ...]:
+        """(handler, recipient) pairs for a template's channels, bound once per handler set"""
+        bound = getattr(template, '_resolved_handlers', None)
+        if bound is None or bound[0] is not self or bound[1] != self._handlers_version:
+            pairs = tuple((self.handlers[channel], NOTIFY_RECIPIENT)
+                          for channel in template.notification_channels
+                          if channel in self.handlers)
+            bound = template._resolved_handlers = (self, self._handlers_version, pairs)
+        return bound[2]
+    
     def create_alert_rule(self, template: AlertTemplate, symbol: str,
                          cooldown_minutes: int = 30) -> AlertRule:
         """Create an active alert rule"""
-        rule_id = hashlib.md5(f"{template.id}{symbol}{datetime.now()}".encode()).hexdigest()
+        rule_id = _new_id()
         rule = AlertRule(id=rule_id, template=template, symbol=symbol,
                         enabled=True, cooldown_minutes=cooldown_minutes)
+        _compile_template(template)  # Picks up conditions toggled since the template was made
         self.rules[rule_id] = rule
+        self._active_rules[rule_id] = rule
+        self._enabled_rule_count += 1
+        self._index_rule(rule)
         self._save_rule_to_db(rule)
+        # The symbols may not tick again soon, so evaluate the new rule on the next pass
+        self.evaluator.mark_dirty(rule._watched_symbols)
         return rule
     
-    def evaluate_rule(self, rule: AlertRule) -> Optional[AlertEvent]:
-        """Evaluate if a rule should trigger"""
-        if not rule.enabled or rule.is_in_cooldown():
+    def _index_rule(self, rule: AlertRule):
+        """Add a rule to the per-symbol indexes"""
+        self._rules_by_symbol.setdefault(rule.symbol, {})[rule.id] = rule
+        for symbol in rule.template._symbols:
+            self._rules_by_watched_symbol.setdefault(symbol, {})[rule.id] = rule
+        rule._watched_symbols = rule.template._symbols
+    
+    def _unindex_rule(self, rule: AlertRule):
+        """Remove a rule from the per-symbol indexes"""
+        for index, symbols in ((self._rules_by_symbol, (rule.symbol,)),
+                               (self._rules_by_watched_symbol, rule._watched_symbols)):
+            for symbol in symbols:
+                bucket = index.get(symbol)
+                if bucket is not None:
+                    bucket.pop(rule.id, None)
+                    if not bucket:
+                        del index[symbol]
+    
+    def evaluate_rule(self, rule: AlertRule, now: Optional[float] = None) -> Optional[AlertEvent]:
+        """
+        Evaluate if a rule should trigger
+        
+        Args:
+            rule: Rule to evaluate
+            now: time.monotonic() snapshot shared by a monitoring tick
+        """
+        if now is None:
+            now = time.monotonic()
+        if not rule.enabled or rule.is_in_cooldown(now):
             return None
         
         template = rule.template
-        results = [self.evaluator.evaluate_condition(c)[0] 
-                  for c in template.conditions if c.enabled]
+        if not hasattr(template, '_compiled_eval'):
+            _compile_template(template)
+        
+        if template._compiled_eval(self.evaluator):
+            return self._trigger(rule, now)
+        return None
+    
+    def evaluate_batch(self, rules: List[AlertRule], now: Optional[float] = None) -> List[AlertEvent]:
+        """
+        Evaluate many rules in one pass
         
-        rule_triggered = (all(results) if results else False) if template.logic_operator == LogicOperator.AND else (any(results) if results else False)
+        The distinct conditions of every eligible rule go through
+        ConditionEvaluator.evaluate_many together, then each template's
+        AND/OR logic is applied once to the resulting mask.
         
-        if rule_triggered:
-            event_id = hashlib.md5(f"{rule.id}{datetime.now()}".encode()).hexdigest()
+        Args:
+            rules: Rules to evaluate
+            now: time.monotonic() snapshot shared by a monitoring tick
+        
+        Returns:
+            Events for the rules that triggered
+        """
+        if now is None:
+            now = time.monotonic()
+        
+        eligible = []
+        conditions: List[AlertCondition] = []
+        positions: Dict[int, int] = {}  # id(condition) -> position in conditions
+        for rule in rules:
+            if not rule.enabled or rule.is_in_cooldown(now):
+                continue
+            template = rule.template
+            if not hasattr(template, '_compiled_eval'):
+                _compile_template(template)
+            for condition in template._enabled_conditions:
+                if id(condition) not in positions:
+                    positions[id(condition)] = len(conditions)
+                    conditions.append(condition)
+            eligible.append(rule)
+        if not eligible:
+            return []
+        
+        met = self.evaluator.evaluate_many(conditions)
+        outcomes: Dict[int, bool] = {}  # id(template) -> triggered
+        events = []
+        for rule in eligible:
+            template = rule.template
+            outcome = outcomes.get(id(template))
+            if outcome is None:
+                outcome = _logic_met(template.logic_operator,
+                                     (met[positions[id(c)]] for c in template._enabled_conditions))
+                outcomes[id(template)] = outcome
+            if outcome:
+                events.append(self._trigger(rule, now))
+        return events
+    
+    def _trigger(self, rule: AlertRule, now: float) -> AlertEvent:
+        """Record, persist and announce an event for a rule whose conditions just held"""
+        template = rule.template
+        event_id = _new_id()
+        
+        with self._state_lock:
+            # Stamped under the lock so alert_events stays ordered by triggered_at
+            now_dt = datetime.now()
             event = AlertEvent(id=event_id, rule_id=rule.id, symbol=rule.symbol,
-                             severity=template.severity,
-                             message=f"Alert: {rule.symbol} - {template.name}",
-                             triggered_at=datetime.now())
-            
+                               severity=template.severity,
+                               message=f"Alert: {rule.symbol} - {template.name}",
+                               triggered_at=now_dt)
             rule.triggered_count += 1
-            rule.last_triggered = datetime.now()
-            
-            self.alert_events.append(event)
-            self._save_event_to_db(event)
-            
-            for channel in template.notification_channels:
-                handler = self.handlers.get(channel)
-                if handler:
-                    handler.send(event, "user@example.com")
-            
-            return event
+            rule.last_triggered = now_dt
+            rule.last_triggered_monotonic = now
+            if rule.cooldown_minutes:
+                self._start_cooldown(rule, now)
+            self._record_event(event, now)
+        self._save_event_to_db(event)
         
-        return None
+        # Fire and forget: channels deliver concurrently and never block evaluation
+        for handler, recipient in self._resolved_handlers(template):
+            self._send_notification(handler, event, recipient)
+        
+        return event
+    
+    def _send_notification(self, handler: NotificationHandler, event: AlertEvent, recipient: str):
+        """Queue one delivery, waiting while MAX_PENDING_NOTIFICATIONS are in flight"""
+        self._notify_slots.acquire()
+        try:
+            future = self._notify_pool.submit(handler.send, event, recipient)
+        except RuntimeError:
+            self._notify_slots.release()  # Pool already shut down by close()
+            return
+        future.add_done_callback(lambda _: self._notify_slots.release())
+    
+    def _record_event(self, event: AlertEvent, now: float):
+        """Append an event to the history and update the running statistics"""
+        if len(self.alert_events) == self.alert_events.maxlen:
+            evicted = self.alert_events[0]  # Pushed out by the append below
+            del self._events_by_id[evicted.id]
+            if not evicted.read:
+                self._unread_count -= 1
+            self._severity_counts[evicted.severity] -= 1
+        self.alert_events.append(event)
+        self._event_times.append(event.triggered_at)
+        self._events_by_id[event.id] = event
+        if not event.read:
+            self._unread_count += 1
+        self._severity_counts[event.severity] += 1
+        self._events_last_24h.append((now, event.id))
+        self._prune_daily_events(now)
+    
+    def _prune_daily_events(self, now: float):
+        """Drop events older than 24 hours from the head of the daily window"""
+        window = self._events_last_24h
+        cutoff = now - 86400
+        while window and window[0][0] <= cutoff:
+            window.popleft()
+    
+    def _start_cooldown(self, rule: AlertRule, now: float):
+        """Park a rule until its cooldown expires"""
+        self._active_rules.pop(rule.id, None)
+        heapq.heappush(self._cooldown_heap, (now + rule.cooldown_minutes * 60, rule.id))
+    
+    def _release_cooldowns(self, now: float) -> List[AlertRule]:
+        """
+        Move rules whose cooldown has expired back into the active set
+        
+        Returns:
+            The released rules, which are due this tick whether or not their symbols ticked
+        """
+        heap = self._cooldown_heap
+        released = []
+        with self._state_lock:
+            while heap and heap[0][0] <= now:
+                _, rule_id = heapq.heappop(heap)
+                rule = self.rules.get(rule_id)
+                if rule is not None:
+                    self._active_rules[rule_id] = rule
+                    released.append(rule)
+        return released
     
     def get_alert_history(self, symbol: Optional[str] = None,
                          hours: int = 24) -> List[AlertEvent]:
         """Get alert history"""
         cutoff_time = datetime.now() - timedelta(hours=hours)
-        events = [e for e in self.alert_events if e.triggered_at > cutoff_time]
+        with self._state_lock:
+            start = bisect.bisect_right(self._event_times, cutoff_time)
+            events = list(itertools.islice(self.alert_events, start, None))
+        
+        # The in-memory window is full and starts after the cutoff, so older events come from disk
+        recent = self.alert_events
+        if len(recent) == recent.maxlen and recent[0].triggered_at > cutoff_time:
+            events.extend(self._load_events(cutoff_time, recent[0].triggered_at))
+        
         return sorted([e for e in events if not symbol or e.symbol == symbol],
                      key=lambda e: e.triggered_at, reverse=True)
     
+    def _load_events(self, after: datetime, before: datetime) -> List[AlertEvent]:
+        """Read persisted events triggered strictly between two times"""
+        self._flush_events()
+        rows = self._conn().execute(
+            "SELECT * FROM alert_events WHERE triggered_at > ? AND triggered_at < ?",
+            (after, before)
+        ).fetchall()
+        return [AlertEvent(id=row[0], rule_id=row[1], symbol=row[2],
+                           severity=AlertSeverity(row[3]), message=row[4],
+                           triggered_at=datetime.fromisoformat(row[5]),
+                           triggered_values=_json_loads(row[6]),
+                           read=bool(row[7]), acknowledged=bool(row[8]))
+                for row in rows]
+    
     def acknowledge_alert(self, event_id: str):
         """Mark alert as acknowledged"""
-        for event in self.alert_events:
-            if event.id == event_id:
-                event.acknowledged = True
-                break
+        event = self._events_by_id.get(event_id)
+        if event:
+            event.acknowledged = True
     
     def start_monitoring(self, check_interval: int = 60):
         """Start monitoring alerts"""
@@ -238,35 +859,81 @@ class CustomAlertEngine(BaseService):
     def stop_monitoring(self):
         """Stop monitoring alerts"""
         self.is_running = False
+        self._flush_events()
+        for handler in self.handlers.values():
+            handler.shutdown()
     
     def _monitoring_loop(self, check_interval: int):
         """Main monitoring loop"""
         while self.is_running:
-            for rule in self.rules.values():
-                self.evaluate_rule(rule)
+            now = time.monotonic()
+            # Released rules missed any ticks during their cooldown, so they are always due
+            due: Dict[str, AlertRule] = {rule.id: rule for rule in self._release_cooldowns(now)}
+            
+            # Otherwise only rules watching a symbol with fresh data can change outcome
+            active = self._active_rules
+            for symbol in self.evaluator.take_dirty_symbols():
+                for rule_id, rule in list(self._rules_by_watched_symbol.get(symbol, {}).items()):
+                    if rule_id in active:
+                        due[rule_id] = rule
+            if due:
+                self._evaluate_due(list(due.values()), now)
             time.sleep(check_interval)
     
+    def _evaluate_due(self, rules: List[AlertRule], now: float):
+        """Evaluate a tick's due rules, fanning out over the pool in EVAL_BATCH_SIZE batches"""
+        if len(rules) <= EVAL_BATCH_SIZE:
+            self.evaluate_batch(rules, now)
+            return
+        # Wait for every batch so the next tick never overlaps this one
+        done, _ = wait([self._eval_pool.submit(self.evaluate_batch, rules[i:i + EVAL_BATCH_SIZE], now)
+                        for i in range(0, len(rules), EVAL_BATCH_SIZE)])
+        for future in done:
+            if future.exception() is not None:
+                self.logger.error(f"Alert batch evaluation failed: {future.exception()}")
+    
     def _save_rule_to_db(self, rule: AlertRule):
         """Save rule to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("INSERT OR REPLACE INTO alert_rules VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                      (rule.id, rule.template.id, rule.symbol, rule.enabled,
-                       rule.triggered_count, rule.last_triggered,
-                       rule.cooldown_minutes, rule.created_at))
-        conn.commit()
-        conn.close()
+        self._conn().execute(_SAVE_RULE_SQL,
+                             (rule.id, rule.template.id, rule.symbol, rule.enabled,
+                              rule.triggered_count, rule.last_triggered,
+                              rule.cooldown_minutes, rule.created_at))
     
     def _save_event_to_db(self, event: AlertEvent):
-        """Save event to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("INSERT INTO alert_events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                      (event.id, event.rule_id, event.symbol, event.severity.value,
-                       event.message, event.triggered_at,
-                       json.dumps(event.triggered_values), event.read, event.acknowledged))
-        conn.commit()
-        conn.close()
+        """Queue an event for the background writer"""
+        self._event_queue.append(
+            (event.id, event.rule_id, event.symbol, event.severity.value,
+             event.message, event.triggered_at,
+             _json_dumps(event.triggered_values) if event.triggered_values else _EMPTY_JSON,
+             event.read, event.acknowledged)
+        )
+        if len(self._event_queue) >= EVENT_BATCH_SIZE:
+            self._flush_event.set()
+    
+    def _db_writer_loop(self):
+        """Flush queued events every EVENT_FLUSH_INTERVAL or once a batch fills up"""
+        while not self._writer_stop.is_set():
+            self._flush_event.wait(EVENT_FLUSH_INTERVAL)
+            self._flush_event.clear()
+            self._flush_events()
+    
+    def _flush_events(self):
+        """Write all queued events in a single transaction"""
+        batch = []
+        while self._event_queue:
+            batch.append(self._event_queue.popleft())
+        if not batch:
+            return
+        
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(_INSERT_EVENT_SQL, batch)
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            self.logger.error(f"Failed to write {len(batch)} alert events: {e}")
     
     def get_alert_templates(self) -> List[AlertTemplate]:
         """Get all alert templates"""
@@ -274,8 +941,9 @@ class CustomAlertEngine(BaseService):
     
     def get_alert_rules(self, symbol: Optional[str] = None) -> List[AlertRule]:
         """Get alert rules"""
-        rules = list(self.rules.values())
-        return [r for r in rules if not symbol or r.symbol == symbol]
+        if not symbol:
+            return list(self.rules.values())
+        return list(self._rules_by_symbol.get(symbol, {}).values())
     
     def get_unread_alerts(self) -> List[AlertEvent]:
         """Get unread alerts"""
@@ -283,31 +951,95 @@ class CustomAlertEngine(BaseService):
     
     def mark_alert_read(self, event_id: str):
         """Mark alert as read"""
-        for event in self.alert_events:
-            if event.id == event_id:
-                event.read = True
-                break
+        event = self._events_by_id.get(event_id)
+        if event:
+            with self._state_lock:
+                if not event.read:
+                    event.read = True
+                    self._unread_count -= 1
     
     def delete_rule(self, rule_id: str) -> bool:
         """Delete an alert rule"""
-        if rule_id in self.rules:
-            del self.rules[rule_id]
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM alert_rules WHERE id = ?", (rule_id,))
-            conn.commit()
-            conn.close()
-            return True
-        return False
+        return bool(self.delete_rules([rule_id]))
+    
+    def delete_rules(self, rule_ids: List[str]) -> int:
+        """
+        Delete several alert rules with a single database transaction
+        
+        Args:
+            rule_ids: Ids of the rules to delete; unknown ids are ignored
+        
+        Returns:
+            Number of rules deleted
+        """
+        deleted = []
+        for rule_id in rule_ids:
+            rule = self.rules.pop(rule_id, None)
+            if rule is None:
+                continue
+            self._active_rules.pop(rule_id, None)
+            if rule.enabled:
+                self._enabled_rule_count -= 1
+            self._unindex_rule(rule)
+            deleted.append((rule_id,))
+        if not deleted:
+            return 0
+        
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(_DELETE_RULE_SQL, deleted)
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            self.logger.error(f"Failed to delete {len(deleted)} alert rules: {e}")
+        return len(deleted)
+    
+    def set_rule_enabled(self, rule_id: str, enabled: bool) -> bool:
+        """
+        Enable or disable an alert rule
+        
+        Args:
+            rule_id: Rule to update
+            enabled: New state
+        
+        Returns:
+            False if the rule does not exist
+        """
+        rule = self.rules.get(rule_id)
+        if rule is None:
+            return False
+        if rule.enabled != enabled:
+            rule.enabled = enabled
+            self._enabled_rule_count += 1 if enabled else -1
+            self._save_rule_to_db(rule)
+            if enabled:
+                self.evaluator.mark_dirty(rule._watched_symbols)
+        return True
     
     def get_statistics(self) -> Dict:
         """Get alert statistics"""
-        return {
-            'total_events': len(self.alert_events),
-            'unread_count': len(self.get_unread_alerts()),
-            'triggered_today': sum(1 for e in self.alert_events
-                                  if (datetime.now() - e.triggered_at).days < 1),
-            'active_rules': sum(1 for r in self.rules.values() if r.enabled),
-            'severity_distribution': {s.value: sum(1 for e in self.alert_events if e.severity == s)
-                                     for s in AlertSeverity}
-        }
+        with self._state_lock:
+            self._prune_daily_events(time.monotonic())
+            return {
+                'total_events': len(self.alert_events),
+                'unread_count': self._unread_count,
+                'triggered_today': len(self._events_last_24h),
+                'active_rules': self._enabled_rule_count,
+                'severity_distribution': {s.value: self._severity_counts[s] for s in AlertSeverity}
+            }
+    
+    def close(self):
+        """Flush pending events and close the alert database connections"""
+        self._writer_stop.set()
+        self._flush_event.set()
+        self._writer_thread.join()
+        self._eval_pool.shutdown(wait=True)
+        self._notify_pool.shutdown(wait=True)
+        self._flush_events()
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        super().close()
@@ -3,12 +3,22 @@ Dividend Tracker Service
 Dividend calendar, yield tracking, ex-date reminders, dividend reinvestment calculator
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from enum import Enum
+import bisect
+import hashlib
+import threading
+import numpy as np
+import pandas as pd
 import yfinance as yf
 
+from utils.cache import CacheManager
+from utils.data_models import DATACLASS_SLOTS
+from utils.jit import njit
+
 
 class DividendFrequency(Enum):
     """Dividend payment frequency"""
@@ -19,7 +29,41 @@ class DividendFrequency(Enum):
     SPECIAL = "special"
 
 
-@dataclass
+# Days between the last two payments -> frequency, as (lower bound, upper bound) ranges
+_INTERVAL_LOWS = [20, 80, 170, 350]
+_INTERVAL_FREQUENCIES = [
+    (40, DividendFrequency.MONTHLY),
+    (100, DividendFrequency.QUARTERLY),
+    (190, DividendFrequency.SEMI_ANNUAL),
+    (370, DividendFrequency.ANNUAL),
+]
+
+_NEXT_PAYMENT_DELTA = {
+    DividendFrequency.MONTHLY: timedelta(days=30),
+    DividendFrequency.QUARTERLY: timedelta(days=91),
+    DividendFrequency.SEMI_ANNUAL: timedelta(days=182),
+    DividendFrequency.ANNUAL: timedelta(days=365),
+}
+
+_PAYMENTS_PER_YEAR = {
+    DividendFrequency.MONTHLY: 12,
+    DividendFrequency.QUARTERLY: 4,
+    DividendFrequency.SEMI_ANNUAL: 2,
+    DividendFrequency.ANNUAL: 1,
+}
+
+
+def _frequency_from_interval(days_between: int) -> Optional[DividendFrequency]:
+    """Classify the gap between two payments, or None if it fits no schedule"""
+    i = bisect.bisect_right(_INTERVAL_LOWS, days_between) - 1
+    if i >= 0:
+        upper, frequency = _INTERVAL_FREQUENCIES[i]
+        if days_between <= upper:
+            return frequency
+    return None
+
+
+@dataclass(**DATACLASS_SLOTS)
 class DividendPayment:
     """Single dividend payment record"""
     symbol: str
@@ -59,9 +103,23 @@ class DividendPayment:
             'yield_percent': self.yield_percent,
             'paid': self.paid
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'DividendPayment':
+        """Create from a to_dict() dictionary"""
+        return cls(
+            symbol=data['symbol'],
+            ex_date=datetime.fromisoformat(data['ex_date']),
+            record_date=datetime.fromisoformat(data['record_date']),
+            payment_date=datetime.fromisoformat(data['payment_date']),
+            amount=data['amount'],
+            frequency=DividendFrequency(data['frequency']),
+            yield_percent=data.get('yield_percent'),
+            paid=data.get('paid', False)
+        )
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class DividendHistory:
     """Dividend payment history for a stock"""
     symbol: str
@@ -72,11 +130,29 @@ class DividendHistory:
     payment_history: List[DividendPayment] = field(default_factory=list)
     last_payment_date: Optional[datetime] = None
     next_payment_date: Optional[datetime] = None
+    _by_year: Dict[int, float] = field(default_factory=dict, init=False, repr=False, compare=False)  # year -> total paid
+    
+    def __post_init__(self):
+        for payment in self.payment_history:
+            self._count_payment(payment)
+    
+    def _count_payment(self, payment: DividendPayment):
+        """Add a payment to its year's running total"""
+        year = payment.payment_date.year
+        self._by_year[year] = self._by_year.get(year, 0.0) + payment.amount
     
     def add_payment(self, payment: DividendPayment):
         """Add dividend payment to history"""
         self.payment_history.append(payment)
         self.payment_history.sort(key=lambda x: x.payment_date)
+        self._count_payment(payment)
+    
+    def add_payments_bulk(self, payments: List[DividendPayment]):
+        """Add many dividend payments, sorting the history once"""
+        self.payment_history.extend(payments)
+        self.payment_history.sort(key=lambda x: x.payment_date)
+        for payment in payments:
+            self._count_payment(payment)
     
     def get_payments_by_year(self, year: int) -> List[DividendPayment]:
         """Get payments for a specific year"""
@@ -86,9 +162,7 @@ class DividendHistory:
         """Get annual dividend amount"""
         if year is None:
             year = datetime.now().year
-        
-        payments = self.get_payments_by_year(year)
-        return sum(p.amount for p in payments)
+        return self._by_year.get(year, 0.0)
     
     def get_dividend_growth(self, years: int = 5) -> float:
         """Calculate dividend growth rate (CAGR)"""
@@ -116,9 +190,25 @@ class DividendHistory:
             'last_payment_date': self.last_payment_date.isoformat() if self.last_payment_date else None,
             'next_payment_date': self.next_payment_date.isoformat() if self.next_payment_date else None
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'DividendHistory':
+        """Create from a to_dict() dictionary"""
+        last_payment = data.get('last_payment_date')
+        next_payment = data.get('next_payment_date')
+        return cls(
+            symbol=data['symbol'],
+            company_name=data.get('company_name'),
+            current_yield=data.get('current_yield', 0.0),
+            annual_dividend=data.get('annual_dividend', 0.0),
+            payout_frequency=DividendFrequency(data.get('payout_frequency', DividendFrequency.QUARTERLY.value)),
+            payment_history=[DividendPayment.from_dict(p) for p in data.get('payment_history', [])],
+            last_payment_date=datetime.fromisoformat(last_payment) if last_payment else None,
+            next_payment_date=datetime.fromisoformat(next_payment) if next_payment else None
+        )
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class PortfolioDividendPlan:
     """Portfolio-wide dividend plan"""
     holdings: Dict[str, float] = field(default_factory=dict)  # symbol -> shares
@@ -186,9 +276,27 @@ class PortfolioDividendPlan:
 class DividendDataFetcher:
     """Fetch dividend information from Yahoo Finance"""
     
-    def __init__(self):
+    DOWNLOAD_BATCH_SIZE = 20  # Symbols per yf.download call
+    CACHE_TTL_HOURS = 24  # Histories carry a price-derived yield, so they are kept one day
+    
+    def __init__(self, cache_dir: str = ".cache/dividends", max_workers: int = 16):
+        """
+        Initialize the fetcher
+        
+        Args:
+            cache_dir: Directory for the on-disk history cache
+            max_workers: Batches downloaded concurrently
+        """
         self.cache = {}
         self.last_update = {}
+        self.disk_cache = CacheManager(cache_dir, ttl_hours=self.CACHE_TTL_HOURS)
+        self.max_workers = max_workers
+        self._lock = threading.Lock()  # Guards cache/last_update across concurrent callers
+    
+    @staticmethod
+    def _cache_key(symbol: str, years: int) -> str:
+        """File cache key for a (symbol, years) history"""
+        return hashlib.md5(f"{symbol}:{years}".encode()).hexdigest()
     
     def fetch_dividend_history(self, symbol: str, years: int = 5) -> DividendHistory:
         """
@@ -197,89 +305,173 @@ class DividendDataFetcher:
         Args:
             symbol: Stock symbol
             years: Years of history to fetch
-            
+        
         Returns:
             DividendHistory object
         """
+        history = self.fetch_dividend_histories([symbol], years)[symbol]
+        with self._lock:
+            built = self.cache.get(symbol) is history
+        if history.company_name or not built:
+            return history  # Served from the file cache, or the fetch failed and this is the empty fallback
         try:
-            ticker = yf.Ticker(symbol)
-            
-            # Get info
-            info = ticker.info if hasattr(ticker, 'info') else {}
-            
-            # Get dividends
-            dividends = ticker.dividends
+            info = yf.Ticker(symbol).info or {}
+            history.company_name = info.get('longName', '')
+            self.disk_cache.set(self._cache_key(symbol, years), history.to_dict())
+        except Exception as e:
+            print(f"Error fetching company info for {symbol}: {e}")
+        return history
+    
+    def fetch_dividend_histories(self, symbols: List[str], years: int = 5) -> Dict[str, DividendHistory]:
+        """
+        Fetch dividend histories for many stocks
+        
+        Histories still in the file cache are loaded from disk. The rest are
+        downloaded DOWNLOAD_BATCH_SIZE at a time with yf.download, up to max_workers
+        batches concurrently, and each history, including its trailing yield, is
+        built from the returned frame and cached.
+        
+        Args:
+            symbols: Stock symbols
+            years: Years of history to fetch
+        
+        Returns:
+            Dict of symbol -> DividendHistory; symbols that failed get an empty history
+        """
+        histories = {}
+        missing = []
+        for symbol in symbols:
+            cached = self.disk_cache.get(self._cache_key(symbol, years))
+            if cached is None:
+                missing.append(symbol)
+                continue
+            try:
+                history = DividendHistory.from_dict(cached)
+            except (KeyError, TypeError, ValueError):
+                missing.append(symbol)  # Written by an older layout; refetch
+                continue
+            with self._lock:
+                self.cache[symbol] = history
+            histories[symbol] = history
+        
+        batches = [missing[i:i + self.DOWNLOAD_BATCH_SIZE]
+                   for i in range(0, len(missing), self.DOWNLOAD_BATCH_SIZE)]
+        if len(batches) > 1:
+            # yfinance releases the GIL while waiting on Yahoo, so batches overlap
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+                downloads = list(executor.map(lambda batch: self._download_dividends(batch, years), batches))
+        else:
+            downloads = [self._download_dividends(batch, years) for batch in batches]
+        
+        for downloaded in downloads:
+            for symbol, (dividends, last_close) in downloaded.items():
+                try:
+                    history = self._build_history(symbol, dividends, last_close, years)
+                except Exception as e:
+                    print(f"Error fetching dividend data for {symbol}: {e}")
+                    continue
+                with self._lock:
+                    self.cache[symbol] = history
+                    self.last_update[symbol] = datetime.now()
+                self.disk_cache.set(self._cache_key(symbol, years), history.to_dict())
+                histories[symbol] = history
+        
+        for symbol in symbols:
+            if symbol not in histories:
+                histories[symbol] = DividendHistory(symbol=symbol)
+        return histories
+    
+    def _download_dividends(self, symbols: List[str], years: int) -> Dict[str, Tuple[pd.Series, float]]:
+        """
+        Download dividends and closing prices for a batch of symbols
+        
+        Returns:
+            Dict of symbol -> (dividend amounts indexed by ex-date, last close)
+        """
+        # One extra year so the payout frequency can be estimated at the start of the window
+        start = datetime.now() - timedelta(days=365 * (years + 1))
+        try:
+            data = yf.download(symbols, start=start, actions=True, auto_adjust=False,
+                               group_by='ticker', progress=False)
+        except Exception as e:
+            print(f"Error fetching dividend data for {', '.join(symbols)}: {e}")
+            return {}
+        if data is None or data.empty:
+            return {}
+        
+        results = {}
+        for symbol in symbols:
+            if isinstance(data.columns, pd.MultiIndex):
+                if symbol not in data.columns.get_level_values(0):
+                    continue
+                frame = data[symbol]
+            else:
+                frame = data
+            closes = frame['Close'].dropna()
+            if closes.empty:
+                continue  # Yahoo returned nothing for this symbol
+            dividends = frame['Dividends'] if 'Dividends' in frame else pd.Series(dtype=float)
+            results[symbol] = (dividends[dividends > 0], float(closes.iloc[-1]))
+        return results
+    
+    def _build_history(self, symbol: str, dividends: pd.Series, last_close: float,
+                       years: int) -> DividendHistory:
+        """Build a DividendHistory from downloaded dividend amounts"""
+        if dividends.index.tz is not None:
+            dividends = dividends.tz_localize(None)
+        
+        # Trailing twelve-month yield as a fraction of the last close
+        trailing = dividends[dividends.index >= datetime.now() - timedelta(days=365)].sum()
+        history = DividendHistory(
+            symbol=symbol,
+            company_name='',
+            current_yield=float(trailing / last_close) if last_close > 0 else 0.0,
+        )
+        
+        # Get dividend frequency (estimate from recent payments)
+        if len(dividends) > 0:
+            # Most recent dividend
+            last_div = dividends.index[-1]
             
-            # Create history
-            history = DividendHistory(
-                symbol=symbol,
-                company_name=info.get('longName', ''),
-                current_yield=info.get('dividendYield', 0) or 0,
-            )
+            # Estimate frequency
+            if len(dividends) > 1:
+                prev_div = dividends.index[-2]
+                frequency = _frequency_from_interval((last_div - prev_div).days)
+                if frequency is not None:
+                    history.payout_frequency = frequency
             
-            # Get dividend frequency (estimate from recent payments)
-            if len(dividends) > 0:
-                # Most recent dividend
-                last_div = dividends.index[-1]
-                amount = dividends.iloc[-1]
-                
-                # Estimate frequency
-                if len(dividends) > 1:
-                    prev_div = dividends.index[-2]
-                    days_between = (last_div - prev_div).days
-                    
-                    if 20 <= days_between <= 40:
-                        history.payout_frequency = DividendFrequency.MONTHLY
-                    elif 80 <= days_between <= 100:
-                        history.payout_frequency = DividendFrequency.QUARTERLY
-                    elif 170 <= days_between <= 190:
-                        history.payout_frequency = DividendFrequency.SEMI_ANNUAL
-                    elif 350 <= days_between <= 370:
-                        history.payout_frequency = DividendFrequency.ANNUAL
-                
-                history.last_payment_date = last_div
-                
-                # Add recent dividends as payments
-                cutoff_date = datetime.now() - timedelta(days=365*years)
-                
-                for date, div_amount in dividends.items():
-                    if date.timestamp() >= cutoff_date.timestamp():
-                        payment = DividendPayment(
-                            symbol=symbol,
-                            ex_date=date,
-                            record_date=date + timedelta(days=1),
-                            payment_date=date + timedelta(days=30),
-                            amount=float(div_amount),
-                            frequency=history.payout_frequency,
-                            yield_percent=history.current_yield,
-                            paid=date < datetime.now()
-                        )
-                        history.add_payment(payment)
-                
-                # Calculate next payment date
-                if history.last_payment_date:
-                    if history.payout_frequency == DividendFrequency.MONTHLY:
-                        history.next_payment_date = history.last_payment_date + timedelta(days=30)
-                    elif history.payout_frequency == DividendFrequency.QUARTERLY:
-                        history.next_payment_date = history.last_payment_date + timedelta(days=91)
-                    elif history.payout_frequency == DividendFrequency.SEMI_ANNUAL:
-                        history.next_payment_date = history.last_payment_date + timedelta(days=182)
-                    else:
-                        history.next_payment_date = history.last_payment_date + timedelta(days=365)
+            history.last_payment_date = last_div
             
-            # Calculate annual dividend
-            current_year = datetime.now().year
-            history.annual_dividend = history.get_annual_dividend(current_year)
+            # Add recent dividends as payments
+            now = datetime.now()
+            cutoff_ts = pd.Timestamp(now - timedelta(days=365*years))
+            recent = dividends[dividends.index >= cutoff_ts]
             
-            # Cache
-            self.cache[symbol] = history
-            self.last_update[symbol] = datetime.now()
+            new_payments = []
+            for date, div_amount in zip(recent.index, recent.values):
+                new_payments.append(DividendPayment(
+                    symbol=symbol,
+                    ex_date=date,
+                    record_date=date + timedelta(days=1),
+                    payment_date=date + timedelta(days=30),
+                    amount=float(div_amount),
+                    frequency=history.payout_frequency,
+                    yield_percent=history.current_yield,
+                    paid=date < now
+                ))
+            history.add_payments_bulk(new_payments)
             
-            return history
+            # Calculate next payment date
+            if history.last_payment_date:
+                history.next_payment_date = history.last_payment_date + _NEXT_PAYMENT_DELTA.get(
+                    history.payout_frequency, timedelta(days=365)
+                )
         
-        except Exception as e:
-            print(f"Error fetching dividend data for {symbol}: {e}")
-            return DividendHistory(symbol=symbol)
+        # Calculate annual dividend
+        current_year = datetime.now().year
+        history.annual_dividend = history.get_annual_dividend(current_year)
+        
+        return history
     
     def get_upcoming_ex_dates(self, symbols: List[str], days: int = 30) -> List[DividendPayment]:
         """
@@ -288,15 +480,13 @@ class DividendDataFetcher:
         Args:
             symbols: List of stock symbols
             days: Look ahead days
-            
+        
         Returns:
             List of upcoming dividend payments
         """
         upcoming = []
         
-        for symbol in symbols:
-            history = self.fetch_dividend_history(symbol)
-            
+        for history in self.fetch_dividend_histories(symbols).values():
             for payment in history.payment_history:
                 if payment.is_upcoming(days):
                     upcoming.append(payment)
@@ -305,6 +495,43 @@ class DividendDataFetcher:
         return upcoming
 
 
+@njit(cache=True)
+def _drip_kernel(initial_shares, dividend_per_payment, payments_per_year, years,
+                 annual_growth_rate, price):
+    """
+    Simulate DRIP payments, reinvesting each one at the current price
+    
+    Returns per-year arrays of (year-end shares, year-end price, dividends paid,
+    shares bought by reinvestment, year-end portfolio value).
+    """
+    shares_by_year = np.empty(years)
+    price_by_year = np.empty(years)
+    dividends_by_year = np.empty(years)
+    reinvested_by_year = np.empty(years)
+    value_by_year = np.empty(years)
+    
+    shares = initial_shares
+    growth = 1 + annual_growth_rate / payments_per_year
+    for year in range(years):
+        year_dividends = 0.0
+        year_reinvested_shares = 0.0
+        for payment in range(payments_per_year):
+            dividend_cash = shares * dividend_per_payment
+            year_dividends += dividend_cash
+            reinvested_shares = dividend_cash / price
+            shares += reinvested_shares
+            year_reinvested_shares += reinvested_shares
+            price *= growth
+        
+        shares_by_year[year] = shares
+        price_by_year[year] = price
+        dividends_by_year[year] = year_dividends
+        reinvested_by_year[year] = year_reinvested_shares
+        value_by_year[year] = shares * price
+    
+    return shares_by_year, price_by_year, dividends_by_year, reinvested_by_year, value_by_year
+
+
 class DividendReinvestmentCalculator:
     """Calculate dividend reinvestment scenarios (DRIP)"""
     
@@ -327,55 +554,35 @@ class DividendReinvestmentCalculator:
             years: Time period to calculate
             annual_growth_rate: Expected annual stock price growth
             stock_price: Current stock price
-            
+        
         Returns:
             Dict with DRIP calculation results
         """
         
         # Determine payments per year
-        freq_map = {
-            DividendFrequency.MONTHLY: 12,
-            DividendFrequency.QUARTERLY: 4,
-            DividendFrequency.SEMI_ANNUAL: 2,
-            DividendFrequency.ANNUAL: 1
-        }
-        payments_per_year = freq_map.get(dividend_frequency, 4)
+        payments_per_year = _PAYMENTS_PER_YEAR.get(dividend_frequency, 4)
         dividend_per_payment = annual_dividend_per_share / payments_per_year
         
-        shares = initial_shares
-        price = stock_price
-        accumulated_value = 0.0
-        history = []
-        
-        for year in range(years):
-            year_shares = shares
-            year_dividends = 0.0
-            year_reinvested_shares = 0.0
-            
-            # Process each dividend payment
-            for payment in range(payments_per_year):
-                # Calculate dividend for this payment
-                dividend_cash = shares * dividend_per_payment
-                year_dividends += dividend_cash
-                
-                # Reinvest dividend (assuming DRIP)
-                reinvested_shares = dividend_cash / price
-                shares += reinvested_shares
-                year_reinvested_shares += reinvested_shares
-                
-                # Stock price growth (annualize and divide by frequency)
-                price *= (1 + annual_growth_rate / payments_per_year)
-            
-            accumulated_value = shares * price
-            
-            history.append({
+        shares_by_year, price_by_year, dividends_by_year, reinvested_by_year, value_by_year = _drip_kernel(
+            float(initial_shares), float(dividend_per_payment), payments_per_year, years,
+            float(annual_growth_rate), float(stock_price)
+        )
+        history = [
+            {
                 'year': year + 1,
                 'shares': shares,
                 'price': price,
-                'dividends': year_dividends,
-                'reinvested_shares': year_reinvested_shares,
-                'portfolio_value': accumulated_value
-            })
+                'dividends': dividends,
+                'reinvested_shares': reinvested_shares,
+                'portfolio_value': value
+            }
+            for year, (shares, price, dividends, reinvested_shares, value) in enumerate(zip(
+                shares_by_year.tolist(), price_by_year.tolist(), dividends_by_year.tolist(),
+                reinvested_by_year.tolist(), value_by_year.tolist()
+            ))
+        ]
+        shares = history[-1]['shares'] if history else initial_shares
+        accumulated_value = history[-1]['portfolio_value'] if history else 0.0
         
         # Calculate results
         initial_value = initial_shares * stock_price
@@ -407,7 +614,7 @@ class DividendReinvestmentCalculator:
         
         Args:
             Same as calculate_drip
-            
+        
         Returns:
             Comparison dict with both scenarios
         """
@@ -417,18 +624,11 @@ class DividendReinvestmentCalculator:
             years, annual_growth_rate, stock_price
         )
         
-        # Without DRIP: dividends are taken as cash
+        # Without DRIP: dividends are taken as cash, so the share count never changes
+        # and both the payouts and the price path have closed forms
         shares = initial_shares
-        price = stock_price
-        cash_dividends = 0.0
-        
-        for year in range(years):
-            # Get dividend cash for the year
-            year_div = shares * annual_dividend_per_share
-            cash_dividends += year_div
-            
-            # Price grows but share count stays same
-            price *= (1 + annual_growth_rate)
+        cash_dividends = shares * annual_dividend_per_share * max(years, 0)
+        price = stock_price * (1 + annual_growth_rate) ** max(years, 0)
         
         without_drip = {
             'initial_investment': initial_shares * stock_price,
@@ -486,7 +686,7 @@ class DividendTracker:
         
         Args:
             holdings: Dict of symbol -> shares
-            
+        
         Returns:
             Weighted portfolio dividend yield
         """
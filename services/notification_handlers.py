@@ -5,6 +5,8 @@ Abstract and concrete implementations for sending alerts via different channels
 
 from abc import ABC, abstractmethod
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from utils.data_models import AlertEvent
 
 
@@ -15,6 +17,10 @@ class NotificationHandler(ABC):
     def send(self, alert_event: AlertEvent, recipient: str) -> bool:
         """Send notification"""
         pass
+    
+    def shutdown(self):
+        """Release any resources held by the handler"""
+        pass
 
 
 class EmailNotificationHandler(NotificationHandler):
@@ -43,6 +49,23 @@ class WebhookNotificationHandler(NotificationHandler):
     def __init__(self, webhook_url: str = None):
         self.webhook_url = webhook_url
         self.enabled = bool(webhook_url)
+        self.session = self._create_session()
+    
+    def _create_session(self) -> requests.Session:
+        """Keep-alive session so repeated webhooks reuse the same connection"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=Retry(total=2, backoff_factor=0.1)
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
+    def shutdown(self):
+        """Close pooled webhook connections"""
+        self.session.close()
     
     def send(self, alert_event: AlertEvent, recipient: str) -> bool:
         """Send webhook notification"""
@@ -51,7 +74,7 @@ class WebhookNotificationHandler(NotificationHandler):
                 return False
             
             payload = alert_event.to_dict()
-            response = requests.post(self.webhook_url, json=payload, timeout=10)
+            response = self.session.post(self.webhook_url, json=payload, timeout=10)
             return response.status_code == 200
         except Exception as e:
             print(f"❌ Webhook send failed: {e}")
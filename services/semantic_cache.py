@@ -0,0 +1,285 @@
+"""
+Semantic Response Cache
+Serve chatbot answers for near-duplicate questions from a sentence-embedding index
+"""
+
+import hashlib
+import importlib.util
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# sentence-transformers pulls in torch, so it is only imported on first lookup
+EMBEDDINGS_AVAILABLE = importlib.util.find_spec('sentence_transformers') is not None
+
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """Cosine-similarity cache of chatbot responses keyed by message embeddings"""
+    
+    MODEL_NAME = 'all-MiniLM-L6-v2'
+    QUANTIZE_AFTER = 10_000  # Entries before the FAISS index switches to int8 codes
+    MAX_ENTRIES = 50_000  # Entries kept before the oldest quarter is evicted
+    TOP_K = 5  # Nearest entries checked per lookup
+    
+    def __init__(self, db_path: Optional[str] = None, threshold: float = 0.9,
+                 ttl: float = 3600.0):
+        """
+        Initialize the cache
+        
+        Args:
+            db_path: SQLite database used to persist cached responses
+            threshold: Minimum cosine similarity for a hit
+            ttl: Seconds a cached response stays valid
+        """
+        self.db_path = db_path
+        self.threshold = threshold
+        self.ttl = ttl
+        self.enabled = EMBEDDINGS_AVAILABLE
+        
+        self._lock = threading.Lock()
+        self._model = None
+        self._index = None
+        self._matrix: Optional[np.ndarray] = None
+        self._vectors: List[np.ndarray] = []
+        self._entries: List[Dict] = []
+        self._positions: Dict[str, int] = {}  # message hash -> entry position
+        self._dim = 0
+        self._loading = False
+    
+    def _start_loading(self) -> None:
+        """Start loading the model in the background (lock must be held)"""
+        if self._loading:
+            return
+        self._loading = True
+        threading.Thread(target=self._load, name="semantic-cache-load", daemon=True).start()
+    
+    def _load(self) -> None:
+        """
+        Load the embedding model and any persisted entries
+        
+        Importing torch and fetching the model can take many seconds, so this
+        runs without the lock; lookups simply miss until the model is ready.
+        """
+        try:
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer(self.MODEL_NAME)
+            matrix, entries = self._read_persisted()
+            with self._lock:
+                self._dim = model.get_sentence_embedding_dimension()
+                self._reset_index()
+                if entries:
+                    self._add_many(matrix, entries)
+                self._model = model
+            logger.info(f"Semantic cache ready with {len(entries)} entries")
+        except Exception as e:
+            logger.warning(f"Semantic cache disabled: {e}")
+            self.enabled = False
+    
+    def _reset_index(self) -> None:
+        """Start an empty index (lock must be held)"""
+        self._index = faiss.IndexFlatIP(self._dim) if FAISS_AVAILABLE else None
+        self._matrix = None
+        self._vectors = []
+        self._entries = []
+        self._positions = {}
+    
+    def _read_persisted(self) -> Tuple[Optional[np.ndarray], List[Tuple[str, Dict]]]:
+        """Read the newest live entries from the chat_cache table"""
+        if not self.db_path:
+            return None, []
+        with sqlite3.connect(self.db_path) as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(chat_cache)")}
+            if columns and 'hash' not in columns:
+                conn.execute("DROP TABLE chat_cache")  # Older layout; the cache is disposable
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS chat_cache (
+                    hash TEXT PRIMARY KEY,
+                    embedding BLOB NOT NULL,
+                    response TEXT NOT NULL,
+                    ts INTEGER NOT NULL
+                )
+            """)
+            cutoff = int(time.time() - self.ttl)
+            conn.execute("DELETE FROM chat_cache WHERE ts <= ?", (cutoff,))
+            rows = conn.execute(
+                "SELECT hash, embedding, response, ts FROM chat_cache ORDER BY ts DESC LIMIT ?",
+                (self.MAX_ENTRIES,)
+            ).fetchall()
+        if not rows:
+            return None, []
+        rows.reverse()  # Oldest first, matching insertion order
+        
+        # Decode all float16 blobs in one pass into a single contiguous float32 matrix
+        matrix = np.frombuffer(b''.join(row[1] for row in rows), dtype=np.float16)
+        matrix = matrix.reshape(len(rows), -1).astype(np.float32)
+        entries = []
+        for key, _, response, ts in rows:
+            entry = json.loads(response)
+            entry['created_at'] = float(ts)
+            entries.append((key, entry))
+        return matrix, entries
+    
+    def _embed(self, text: str) -> np.ndarray:
+        """Unit-length float32 embedding for a message"""
+        return self._model.encode([text], normalize_embeddings=True)[0].astype(np.float32)
+    
+    def _add_many(self, matrix: np.ndarray, entries: List[Tuple[str, Dict]]) -> None:
+        """Append rows of unit-length embeddings and their (hash, entry) pairs to the index"""
+        if self._index is not None:
+            self._index.add(matrix)
+            if isinstance(self._index, faiss.IndexFlat) and self._index.ntotal >= self.QUANTIZE_AFTER:
+                self._quantize_index()
+        else:
+            self._vectors.extend(matrix)
+            self._matrix = None
+        for key, entry in entries:
+            self._positions[key] = len(self._entries)
+            self._entries.append(entry)
+    
+    def _quantize_index(self) -> None:
+        """
+        Replace the flat float32 index with an 8-bit scalar-quantized one
+        
+        Trained on every vector cached so far, which cuts index memory 4x
+        while keeping inner products well within the hit threshold's tolerance.
+        """
+        vectors = self._index.reconstruct_n(0, self._index.ntotal)
+        index = faiss.IndexScalarQuantizer(
+            vectors.shape[1], faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT
+        )
+        index.train(vectors)
+        index.add(vectors)
+        self._index = index
+        logger.info(f"Semantic cache index quantized to 8-bit ({index.ntotal} entries)")
+    
+    def _put(self, key: str, embedding: np.ndarray, entry: Dict) -> None:
+        """Insert an entry, replacing the one for the same message if present"""
+        position = self._positions.get(key)
+        if position is not None:
+            self._entries[position] = entry  # Same message, same embedding
+        else:
+            self._add_many(embedding.reshape(1, -1), [(key, entry)])
+            if len(self._entries) > self.MAX_ENTRIES:
+                self._evict()
+    
+    def _evict(self) -> None:
+        """
+        Drop expired entries, then the oldest, down to 3/4 of MAX_ENTRIES
+        
+        FAISS indexes cannot cheaply remove rows, so the index is rebuilt from
+        the surviving vectors.
+        """
+        if self._index is not None:
+            vectors = self._index.reconstruct_n(0, self._index.ntotal)
+        else:
+            vectors = np.vstack(self._vectors)
+        keys = [None] * len(self._entries)
+        for key, position in self._positions.items():
+            keys[position] = key
+        
+        cutoff = time.time() - self.ttl
+        live = [i for i, entry in enumerate(self._entries) if entry['created_at'] > cutoff]
+        live.sort(key=lambda i: self._entries[i]['created_at'])
+        keep = sorted(live[-(self.MAX_ENTRIES * 3 // 4):])
+        entries = [(keys[i], self._entries[i]) for i in keep]
+        
+        self._reset_index()
+        if keep:
+            self._add_many(vectors[keep], entries)
+        logger.info(f"Semantic cache evicted down to {len(keep)} entries")
+    
+    @staticmethod
+    def _hash(message: str) -> str:
+        """Stable key for a normalized message"""
+        return hashlib.sha1(message.encode('utf-8')).hexdigest()
+    
+    def _nearest(self, embedding: np.ndarray, k: int) -> List[Tuple[float, int]]:
+        """Return (similarity, position) of up to k closest cached embeddings, best first"""
+        if not self._entries:
+            return []
+        if self._index is not None:
+            scores, ids = self._index.search(embedding.reshape(1, -1), k)
+            return [(float(score), int(i)) for score, i in zip(scores[0], ids[0]) if i >= 0]
+        if self._matrix is None:
+            self._matrix = np.vstack(self._vectors)
+        scores = self._matrix @ embedding
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(float(scores[i]), int(i)) for i in top]
+    
+    def lookup(self, message: str, stocks_mentioned: List[str]) -> Tuple[Optional[Dict], Optional[np.ndarray]]:
+        """
+        Find a cached response for a similar message
+        
+        The first call starts loading the model in the background; until it
+        is ready every lookup misses without an embedding. The TOP_K nearest
+        entries are checked, so an expired or mismatched nearest entry does
+        not hide a valid one just behind it.
+        
+        Args:
+            message: Normalized user message
+            stocks_mentioned: Symbols in the message; a hit must mention the same ones
+        
+        Returns:
+            (cached response or None, message embedding or None)
+        """
+        if not self.enabled:
+            return None, None
+        with self._lock:
+            if self._model is None:
+                self._start_loading()
+                return None, None
+            embedding = self._embed(message)
+            now = time.time()
+            for similarity, position in self._nearest(embedding, self.TOP_K):
+                if similarity < self.threshold:
+                    break
+                entry = self._entries[position]
+                if (entry['stocks_mentioned'] == stocks_mentioned
+                        and now - entry['created_at'] <= self.ttl):
+                    response = {k: v for k, v in entry.items() if k != 'created_at'}
+                    return response, embedding
+            return None, embedding
+    
+    def store(self, message: str, embedding: Optional[np.ndarray], response: Dict) -> None:
+        """
+        Cache a response under the embedding returned by lookup()
+        
+        Embeddings are persisted as float16, which halves the table size and
+        leaves cosine similarity essentially unchanged for unit vectors.
+        
+        Args:
+            message: Normalized user message
+            embedding: Embedding of the message that produced the response
+            response: Response dictionary from the chatbot
+        """
+        if embedding is None or not self.enabled:
+            return
+        key = self._hash(message)
+        payload = {k: v for k, v in response.items() if k != 'timestamp'}
+        created_at = time.time()
+        with self._lock:
+            self._put(key, embedding, {**payload, 'created_at': created_at})
+            if self.db_path:
+                try:
+                    with sqlite3.connect(self.db_path) as conn:
+                        conn.execute(
+                            "INSERT OR REPLACE INTO chat_cache (hash, embedding, response, ts) VALUES (?, ?, ?, ?)",
+                            (key, embedding.astype(np.float16).tobytes(), json.dumps(payload), int(created_at))
+                        )
+                except Exception as e:
+                    logger.error(f"Error persisting chat cache entry: {e}")
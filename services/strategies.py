@@ -3,9 +3,113 @@ Trading Strategy Definitions
 Define various technical analysis trading strategies for backtesting
 """
 
-from abc import ABC, abstractmethod
+from abc import ABC
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+import numpy as np
 import pandas as pd
 
+from utils.jit import njit
+
+
+# Set only inside rolling_cache(); maps (id(close), window) -> (close, mean). Holding
+# the close array keeps its id from being reused by another array while cached.
+_rolling_mean_cache: ContextVar[Optional[Dict[Tuple[int, int], Tuple[np.ndarray, np.ndarray]]]] = \
+    ContextVar('rolling_mean_cache', default=None)
+
+
+@contextmanager
+def rolling_cache():
+    """
+    Memoize rolling means while the context is active
+    
+    Used by parameter sweeps that evaluate many strategies over the same close
+    array, so each (array, window) mean is computed once per sweep. The cache
+    is local to the current thread/context and nested uses restore the outer one.
+    """
+    token = _rolling_mean_cache.set({})
+    try:
+        yield
+    finally:
+        _rolling_mean_cache.reset(token)
+
+
+def _rolling_mean_arr(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing mean over `window` values, matching pandas rolling(window).mean()
+    
+    NaN until the window is full and wherever the window holds a NaN; NaNs are
+    zeroed before the cumulative sum so one gap does not spread to later bars.
+    """
+    out = np.full(len(values), np.nan)
+    if 0 < window <= len(values):
+        missing = np.isnan(values)
+        csum = np.cumsum(np.concatenate(([0.0], np.where(missing, 0.0, values))))
+        nan_count = np.cumsum(np.concatenate(([0], missing)))
+        full = (nan_count[window:] - nan_count[:-window]) == 0
+        out[window - 1:] = np.where(full, (csum[window:] - csum[:-window]) / window, np.nan)
+    return out
+
+
+def _rolling_std_arr(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing sample standard deviation over `window` values"""
+    out = np.full(len(values), np.nan)
+    if 1 < window <= len(values):
+        windows = np.lib.stride_tricks.sliding_window_view(values, window)
+        out[window - 1:] = windows.std(axis=1, ddof=1)
+    return out
+
+
+@njit(cache=True)
+def _ewm_mean_arr(values: np.ndarray, span: int) -> np.ndarray:
+    """
+    Exponentially weighted mean matching pandas ewm(span=...).mean()
+    
+    Follows pandas' adjust=True, ignore_na=False recursion: NaN until the first
+    observation, a NaN input repeats the previous mean, and missing bars still
+    decay the weight of older observations.
+    """
+    decay = 1.0 - 2.0 / (span + 1.0)
+    out = np.empty(values.shape[0])
+    mean = np.nan
+    old_weight = 1.0
+    for i in range(values.shape[0]):
+        value = values[i]
+        observed = not np.isnan(value)
+        if not np.isnan(mean):
+            old_weight *= decay
+            if observed:
+                mean = (old_weight * mean + value) / (old_weight + 1.0)
+                old_weight += 1.0
+        elif observed:
+            mean = value
+            old_weight = 1.0
+        out[i] = mean
+    return out
+
+
+def rolling_mean(close: np.ndarray, window: int) -> np.ndarray:
+    """Rolling mean of close prices, served from the sweep cache when active"""
+    cache = _rolling_mean_cache.get()
+    if cache is None:
+        return _rolling_mean_arr(close, window)
+    
+    key = (id(close), window)
+    entry = cache.get(key)
+    if entry is None or entry[0] is not close:
+        entry = (close, _rolling_mean_arr(close, window))
+        cache[key] = entry
+    return entry[1]
+
+
+def _crossover_signals(buy_mask: np.ndarray, sell_mask: np.ndarray) -> np.ndarray:
+    """Build an int8 signal array: 1 where buy_mask, -1 where sell_mask, else 0"""
+    signals = np.zeros(len(buy_mask), dtype=np.int8)
+    signals[buy_mask] = 1
+    signals[sell_mask] = -1
+    return signals
+
 
 class Strategy(ABC):
     """Abstract base class for trading strategies"""
@@ -13,13 +117,42 @@ class Strategy(ABC):
     def __init__(self, name: str):
         self.name = name
     
-    @abstractmethod
     def generate_signals(self, data: pd.DataFrame) -> pd.Series:
         """
         Generate buy/sell signals based on data
         Returns: Series with values: 1 (buy), -1 (sell), 0 (hold)
         """
-        pass
+        if type(self)._generate_signals_arr is Strategy._generate_signals_arr:
+            raise NotImplementedError(
+                f"{type(self).__name__} must implement generate_signals or _generate_signals_arr"
+            )
+        close = data['Close'].to_numpy(dtype=np.float64)
+        return pd.Series(self._generate_signals_arr(close), index=data.index)
+    
+    def _generate_signals_arr(self, close: np.ndarray) -> np.ndarray:
+        """
+        Generate buy/sell signals from a close price array
+        Returns: int8 array with values: 1 (buy), -1 (sell), 0 (hold)
+        
+        Defaults to generate_signals() on a Close-only frame, so strategies
+        written against the DataFrame API keep working on array callers.
+        """
+        signals = self.generate_signals(pd.DataFrame({'Close': close}))
+        return signals.fillna(0).to_numpy(dtype=np.int8)
+    
+    def signals_for(self, data: pd.DataFrame, close: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Generate signals for a backtest as an int8 array
+        
+        Uses the array path unless a subclass overrides generate_signals, in
+        which case it is called with the full OHLCV frame. Pass the same close
+        array across a sweep so rolling_cache() can reuse its means.
+        """
+        if type(self).generate_signals is Strategy.generate_signals:
+            if close is None:
+                close = data['Close'].to_numpy(dtype=np.float64)
+            return self._generate_signals_arr(close)
+        return self.generate_signals(data).fillna(0).to_numpy(dtype=np.int8)
 
 
 class SimpleMovingAverageCrossover(Strategy):
@@ -30,18 +163,12 @@ class SimpleMovingAverageCrossover(Strategy):
         self.fast_period = fast_period
         self.slow_period = slow_period
     
-    def generate_signals(self, data: pd.DataFrame) -> pd.Series:
+    def _generate_signals_arr(self, close: np.ndarray) -> np.ndarray:
         """Generate signals from SMA crossover"""
-        close = data['Close']
-        
-        fast_sma = close.rolling(window=self.fast_period).mean()
-        slow_sma = close.rolling(window=self.slow_period).mean()
-        
-        signals = pd.Series(0, index=data.index)
-        signals[fast_sma > slow_sma] = 1
-        signals[fast_sma < slow_sma] = -1
+        fast_sma = rolling_mean(close, self.fast_period)
+        slow_sma = rolling_mean(close, self.slow_period)
         
-        return signals
+        return _crossover_signals(fast_sma > slow_sma, fast_sma < slow_sma)
 
 
 class RelativeStrengthIndex(Strategy):
@@ -53,22 +180,17 @@ class RelativeStrengthIndex(Strategy):
         self.oversold = oversold
         self.overbought = overbought
     
-    def generate_signals(self, data: pd.DataFrame) -> pd.Series:
+    def _generate_signals_arr(self, close: np.ndarray) -> np.ndarray:
         """Generate signals from RSI"""
-        close = data['Close']
-        
-        delta = close.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=self.period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=self.period).mean()
-        
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
+        delta = np.diff(close, prepend=np.nan)
+        gain = _rolling_mean_arr(np.where(delta > 0, delta, 0.0), self.period)
+        loss = _rolling_mean_arr(np.where(delta < 0, -delta, 0.0), self.period)
         
-        signals = pd.Series(0, index=data.index)
-        signals[rsi < self.oversold] = 1
-        signals[rsi > self.overbought] = -1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = gain / loss
+            rsi = 100 - (100 / (1 + rs))
         
-        return signals
+        return _crossover_signals(rsi < self.oversold, rsi > self.overbought)
 
 
 class BollingerBands(Strategy):
@@ -79,21 +201,15 @@ class BollingerBands(Strategy):
         self.period = period
         self.num_std = num_std
     
-    def generate_signals(self, data: pd.DataFrame) -> pd.Series:
+    def _generate_signals_arr(self, close: np.ndarray) -> np.ndarray:
         """Generate signals from Bollinger Bands"""
-        close = data['Close']
-        
-        sma = close.rolling(window=self.period).mean()
-        std = close.rolling(window=self.period).std()
+        sma = rolling_mean(close, self.period)
+        std = _rolling_std_arr(close, self.period)
         
         upper_band = sma + (self.num_std * std)
         lower_band = sma - (self.num_std * std)
         
-        signals = pd.Series(0, index=data.index)
-        signals[close <= lower_band] = 1
-        signals[close >= upper_band] = -1
-        
-        return signals
+        return _crossover_signals(close <= lower_band, close >= upper_band)
 
 
 class MACD(Strategy):
@@ -105,18 +221,12 @@ class MACD(Strategy):
         self.slow_period = slow_period
         self.signal_period = signal_period
     
-    def generate_signals(self, data: pd.DataFrame) -> pd.Series:
+    def _generate_signals_arr(self, close: np.ndarray) -> np.ndarray:
         """Generate signals from MACD"""
-        close = data['Close']
-        
-        fast_ema = close.ewm(span=self.fast_period).mean()
-        slow_ema = close.ewm(span=self.slow_period).mean()
+        fast_ema = _ewm_mean_arr(close, self.fast_period)
+        slow_ema = _ewm_mean_arr(close, self.slow_period)
         
         macd = fast_ema - slow_ema
-        signal_line = macd.ewm(span=self.signal_period).mean()
-        
-        signals = pd.Series(0, index=data.index)
-        signals[macd > signal_line] = 1
-        signals[macd < signal_line] = -1
+        signal_line = _ewm_mean_arr(macd, self.signal_period)
         
-        return signals
+        return _crossover_signals(macd > signal_line, macd < signal_line)
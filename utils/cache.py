@@ -14,7 +14,7 @@ class CacheManager:
     
     def __init__(self, cache_dir: str = ".cache", ttl_hours: int = 4):
         self.cache_dir = Path(cache_dir)
-        self.cache_dir.mkdir(exist_ok=True)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.ttl = timedelta(hours=ttl_hours)
     
     def get(self, key: str) -> Optional[Dict]:
@@ -7,8 +7,12 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, Optional, List
 from enum import Enum
+import sys
 import numpy as np
 
+# dataclass(slots=True) needs Python 3.10+; older interpreters keep a per-instance __dict__
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 
 # ==================== BACKTESTING MODELS ====================
 
@@ -502,10 +506,21 @@ class AlertRule:
     last_triggered: Optional[datetime] = None
     cooldown_minutes: int = 0
     created_at: datetime = field(default_factory=datetime.now)
+    last_triggered_monotonic: Optional[float] = field(default=None, repr=False, compare=False)
     
-    def is_in_cooldown(self) -> bool:
-        """Check if rule is in cooldown period"""
-        if not self.last_triggered or self.cooldown_minutes == 0:
+    def is_in_cooldown(self, now_mono: Optional[float] = None) -> bool:
+        """
+        Check if rule is in cooldown period
+        
+        Args:
+            now_mono: time.monotonic() reading; used when the rule was triggered
+                in this process, avoiding a datetime.now() call
+        """
+        if self.cooldown_minutes == 0:
+            return False
+        if now_mono is not None and self.last_triggered_monotonic is not None:
+            return now_mono - self.last_triggered_monotonic < self.cooldown_minutes * 60
+        if not self.last_triggered:
             return False
         
         from datetime import timedelta
@@ -526,7 +541,7 @@ class AlertRule:
         }
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class AlertEvent:
     """Triggered alert event"""
     id: str